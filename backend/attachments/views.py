@@ -7,11 +7,14 @@ from rest_framework.views import APIView
 from django.conf import settings
 from django.http import FileResponse, Http404
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from .models import Attachment
 from .serializers import AttachmentSerializer
 from .permissions import AttachmentPermissions
 from tasks.models import Task
 from tasks.permissions import user_has_perm, user_can_view_task
+from tasks.cache import invalidate_task_lists
+from tasks.visibility import task_audience_ids
 
 MAX_FILE_SIZE = getattr(settings, "FILE_UPLOAD_MAX_MEMORY_SIZE", 10 * 1024 * 1024)
 ALLOWED_EXT = set().union(
@@ -19,6 +22,14 @@ ALLOWED_EXT = set().union(
 ) or {".pdf", ".doc", ".docx", ".xls", ".xlsx", ".txt", ".jpg", ".jpeg", ".png", ".gif"}
 
 
+def _touch_task(task_id):
+    """Bump the parent task's updated_at and drop cached task lists so attachment_count is refreshed."""
+    task = Task.objects.filter(pk=task_id).first() if task_id else None
+    if task:
+        Task.objects.filter(pk=task_id).update(updated_at=timezone.now())
+        invalidate_task_lists(task_audience_ids(task))
+
+
 class AttachmentListCreateView(generics.ListCreateAPIView):
     serializer_class = AttachmentSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -53,7 +64,8 @@ class AttachmentListCreateView(generics.ListCreateAPIView):
             )
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(uploaded_by=request.user, filename=file.name)
+        attachment = serializer.save(uploaded_by=request.user, filename=file.name)
+        _touch_task(attachment.task_id)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
@@ -63,6 +75,11 @@ class AttachmentDetailView(generics.RetrieveDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated, AttachmentPermissions]
     lookup_url_kwarg = "pk"
 
+    def perform_destroy(self, instance):
+        task_id = instance.task_id
+        instance.delete()
+        _touch_task(task_id)
+
 
 class AttachmentFileView(APIView):
     """Serve attachment file for preview/download with auth. Returns inline so browser can display PDF/images."""
@@ -0,0 +1,15 @@
+from django_filters import IsoDateTimeFilter, NumberFilter
+from django_filters.rest_framework import FilterSet
+from .models import AuditLog
+
+
+class AuditLogFilter(FilterSet):
+    """Time range is half-open: created_at__gte <= created_at < created_at__lt (ISO 8601)."""
+    user = NumberFilter(field_name="user_id")
+    object_id = NumberFilter(field_name="object_id")
+    created_at__gte = IsoDateTimeFilter(field_name="created_at", lookup_expr="gte")
+    created_at__lt = IsoDateTimeFilter(field_name="created_at", lookup_expr="lt")
+
+    class Meta:
+        model = AuditLog
+        fields = ["model_name", "action", "user", "object_id", "created_at__gte", "created_at__lt"]
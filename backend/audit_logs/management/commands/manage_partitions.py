@@ -0,0 +1,38 @@
+"""
+Maintain the monthly partitions of the audit log and notification tables (Postgres only):
+create upcoming partitions and detach or drop those past their retention. Also runs daily
+as the audit_logs.manage_partitions Celery task.
+
+    python manage.py manage_partitions --months-ahead 3 --dry-run
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from config.partitioning import apply_retention, ensure_partitions, partitioned_tables
+
+
+class Command(BaseCommand):
+    help = "Create future monthly partitions and apply partition retention."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD,
+            help="Months of partitions to keep created ahead of the current one.",
+        )
+        parser.add_argument("--no-retention", action="store_true", help="Only create partitions.")
+        parser.add_argument("--dry-run", action="store_true", help="Report expired partitions without touching them.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("manage_partitions requires PostgreSQL.")
+        for table, retention_months in partitioned_tables().items():
+            if not options["dry_run"]:
+                created = ensure_partitions(table, options["months_ahead"])
+                self.stdout.write(f"{table}: partitions through {created[-1]}")
+            if options["no_retention"]:
+                continue
+            expired = apply_retention(table, retention_months, dry_run=options["dry_run"])
+            if expired:
+                verb = "would expire" if options["dry_run"] else settings.PARTITION_RETENTION_MODE
+                self.stdout.write(f"{table}: {verb} {', '.join(expired)}")
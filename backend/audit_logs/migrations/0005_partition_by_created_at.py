@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from config.partitioning import convert_to_partitioned, convert_to_unpartitioned
+
+# Postgres only: rebuild the table as monthly RANGE (created_at) partitions (see
+# config.partitioning). Other databases keep the plain table.
+TABLE = "audit_logs_auditlog"
+
+
+def forwards(apps, schema_editor):
+    convert_to_partitioned(schema_editor, TABLE)
+
+
+def backwards(apps, schema_editor):
+    convert_to_unpartitioned(schema_editor, TABLE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_logs', '0004_audit_created_at_default'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
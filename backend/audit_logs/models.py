@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class AuditLog(models.Model):
@@ -23,10 +24,18 @@ class AuditLog(models.Model):
     model_name = models.CharField(max_length=50)
     object_id = models.PositiveIntegerField(null=True, blank=True)
     changes = models.JSONField(default=dict, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Stamped when the entry is recorded (audit_logs.sink), which may be before the row is inserted.
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["model_name", "object_id", "created_at"], name="audit_model_object_created_idx"),
+            models.Index(fields=["user", "-created_at"], name="audit_user_created_idx"),
+            # Cursor pagination of the audit log API (audit_logs.pagination) and object_id-only lookups.
+            models.Index(fields=["-created_at", "-id"], name="audit_created_id_idx"),
+            models.Index(fields=["object_id", "-created_at"], name="audit_object_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.action} {self.model_name} by {self.user_id}"
@@ -0,0 +1,12 @@
+from config.pagination import KeysetPagination
+
+
+class AuditLogKeysetPagination(KeysetPagination):
+    """
+    Newest first over (created_at, id); ?ordering=created_at reads history oldest first.
+    created_at is NOT NULL, so pages are ordered by plain created_at DESC, id DESC and sought
+    with (created_at, id) < (v, pk): one range scan of audit_created_id_idx per page.
+    """
+    ordering_fields = ("created_at",)
+    default_ordering = "-created_at"
+    max_page_size = 500
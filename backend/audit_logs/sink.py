@@ -0,0 +1,111 @@
+"""
+Audit log sink.
+
+record() is the single entry point for writing AuditLog rows. Inside an audit_batch()
+block entries are buffered and written with one bulk_create when the block exits cleanly
+(nested blocks join the outermost one); outside a block each entry is written on its own.
+Entries are timestamped when recorded, so ordering by (created_at, id) follows the order
+things happened no matter when the rows are inserted.
+
+With AUDIT_LOG_ASYNC on, a batch is instead handed to the audit_logs.write_audit_entries
+Celery task once the surrounding transaction commits (so rolled-back work leaves no audit
+trail) and the request does no audit INSERT at all. Rows then show up shortly after the
+commit; if the broker is unreachable the batch is written synchronously instead.
+
+    with transaction.atomic(), audit_batch():
+        ...
+        record(user, AuditLog.ACTION_STATUS, "task", task.id, {"status": "finished", "previous": "ongoing"})
+"""
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def entry(user, action, model_name, object_id, changes=None):
+    """Unsaved AuditLog row; user may be a user instance or an id."""
+    user_id = getattr(user, "pk", user)
+    return AuditLog(
+        user_id=user_id,
+        action=action,
+        model_name=model_name,
+        object_id=object_id,
+        changes=changes or {},
+        created_at=timezone.now(),
+    )
+
+
+def record(user, action, model_name, object_id, changes=None):
+    record_entries([entry(user, action, model_name, object_id, changes)])
+
+
+def record_entries(entries):
+    """Record already-built AuditLog rows (e.g. collected by tasks.bulk)."""
+    buffer = getattr(_local, "buffer", None)
+    if buffer is not None:
+        buffer.extend(entries)
+    else:
+        _write(entries)
+
+
+@contextmanager
+def audit_batch():
+    """Buffer every entry recorded in the block and write them together on a clean exit."""
+    if getattr(_local, "buffer", None) is not None:
+        yield
+        return
+    _local.buffer = []
+    try:
+        yield
+        entries = _local.buffer
+    finally:
+        _local.buffer = None
+    _write(entries)
+
+
+def _write(entries):
+    entries = list(entries)
+    if not entries:
+        return
+    if getattr(settings, "AUDIT_LOG_ASYNC", False):
+        payload = [serialize_entry(e) for e in entries]
+        transaction.on_commit(lambda: _enqueue(payload))
+    else:
+        AuditLog.objects.bulk_create(entries)
+
+
+def _enqueue(payload):
+    from .tasks import write_audit_entries
+
+    try:
+        write_audit_entries.apply_async(args=[payload], queue=settings.AUDIT_LOG_QUEUE)
+    except Exception:
+        logger.warning("audit log queue unavailable; writing %d entries inline", len(payload), exc_info=True)
+        write_serialized(payload)
+
+
+def serialize_entry(e):
+    return {
+        "user_id": e.user_id,
+        "action": e.action,
+        "model_name": e.model_name,
+        "object_id": e.object_id,
+        "changes": e.changes,
+        "created_at": e.created_at.isoformat(),
+    }
+
+
+def write_serialized(payload):
+    AuditLog.objects.bulk_create(
+        [AuditLog(**{**item, "created_at": parse_datetime(item["created_at"])}) for item in payload]
+    )
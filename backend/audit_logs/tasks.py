@@ -0,0 +1,23 @@
+"""
+Celery tasks for audit logs.
+"""
+from celery import shared_task
+from config.partitioning import apply_retention, ensure_partitions, partitioned_tables
+from .sink import write_serialized
+
+
+@shared_task(name="audit_logs.write_audit_entries")
+def write_audit_entries(entries) -> dict:
+    """Insert a batch of audit entries handed off by audit_logs.sink (AUDIT_LOG_ASYNC)."""
+    write_serialized(entries)
+    return {"written": len(entries)}
+
+
+@shared_task(name="audit_logs.manage_partitions")
+def manage_partitions() -> dict:
+    """Daily: create upcoming monthly partitions and expire old ones (see config.partitioning)."""
+    result = {}
+    for table, retention_months in partitioned_tables().items():
+        ensure_partitions(table)
+        result[table] = apply_retention(table, retention_months)
+    return result
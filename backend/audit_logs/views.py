@@ -1,17 +1,25 @@
 from rest_framework import generics, permissions
 from django_filters.rest_framework import DjangoFilterBackend
+from .filters import AuditLogFilter
 from .models import AuditLog
+from .pagination import AuditLogKeysetPagination
 from .serializers import AuditLogSerializer
 
 
 class AuditLogListView(generics.ListAPIView):
+    """
+    Cursor-paginated ({"next", "results"}, follow `next`) so any page of the history costs the
+    same: no COUNT and no OFFSET. Narrow with model_name, action, user, object_id and the
+    created_at__gte / created_at__lt range, which also prunes the monthly partitions.
+    """
     serializer_class = AuditLogSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = AuditLogKeysetPagination
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ["model_name", "action", "user"]
+    filterset_class = AuditLogFilter
 
     def get_queryset(self):
-        qs = AuditLog.objects.select_related("user").order_by("-created_at")
+        qs = AuditLog.objects.select_related("user")
         if not self.request.user.is_staff:
             qs = qs.filter(user=self.request.user)
-        return qs[:500]
+        return qs
@@ -57,5 +57,8 @@ class NotificationConsumer(AsyncWebsocketConsumer):
     async def send_notification(self, event):
         await self.send(text_data=json.dumps(event["payload"]))
 
+    async def notification_updated(self, event):
+        await self.send(text_data=json.dumps({"type": "notification_updated", "payload": event["payload"]}))
+
     async def task_list_invalidate(self, event):
         await self.send(text_data=json.dumps({"type": "task_list_invalidate", "payload": event.get("payload", {})}))
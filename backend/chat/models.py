@@ -33,6 +33,9 @@ class Message(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["channel", "created_at"], name="chat_msg_channel_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.sender} in {self.channel_id}: {self.content[:50]}"
@@ -1,12 +1,14 @@
 import os
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
+from django.db import transaction
 from rest_framework import generics, permissions
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.conf import settings
 from .models import Channel, Message, MessageAttachment
 from .serializers import ChannelSerializer, MessageSerializer
+from notifications import outbox
+from notifications.dispatch import NotificationDispatcher
 from notifications.models import Notification
+from config.conditional import ConditionalGetMixin
 
 MAX_FILE_SIZE = getattr(settings, "FILE_UPLOAD_MAX_MEMORY_SIZE", 10 * 1024 * 1024)
 ALLOWED_EXT = set().union(
@@ -40,7 +42,7 @@ class ChannelDetailView(generics.RetrieveAPIView):
         return Channel.objects.filter(members=self.request.user)
 
 
-class MessageListCreateView(generics.ListCreateAPIView):
+class MessageListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
@@ -49,37 +51,38 @@ class MessageListCreateView(generics.ListCreateAPIView):
         channel_id = self.kwargs.get("channel_id")
         return Message.objects.filter(channel_id=channel_id).select_related("sender").prefetch_related("attachments").order_by("created_at")
 
+    # Messages are append-only (attachments are saved with the message), so the default
+    # get_row_fingerprint (pk per row on the page) identifies the page.
+
     def perform_create(self, serializer):
         channel_id = self.kwargs.get("channel_id")
         channel = Channel.objects.filter(members=self.request.user).get(id=channel_id)
-        message = serializer.save(channel=channel, sender=self.request.user)
         files = self.request.FILES.getlist("attachments") or self.request.FILES.getlist("files") or []
-        for f in files:
-            ext = os.path.splitext(f.name)[1].lower()
-            if ext not in ALLOWED_EXT or f.size > MAX_FILE_SIZE:
-                continue
-            MessageAttachment.objects.create(
-                message=message,
-                file=f,
-                filename=f.name,
-                uploaded_by=self.request.user,
-            )
+        # Message and its attachments become visible together (the list ETag keys on message ids only).
+        with transaction.atomic():
+            message = serializer.save(channel=channel, sender=self.request.user)
+            for f in files:
+                ext = os.path.splitext(f.name)[1].lower()
+                if ext not in ALLOWED_EXT or f.size > MAX_FILE_SIZE:
+                    continue
+                MessageAttachment.objects.create(
+                    message=message,
+                    file=f,
+                    filename=f.name,
+                    uploaded_by=self.request.user,
+                )
         message.refresh_from_db()
-        channel_layer = get_channel_layer()
-        if channel_layer:
-            payload = MessageSerializer(message).data
-            async_to_sync(channel_layer.group_send)(
-                f"chat_{channel_id}",
-                {"type": "chat_message", "message": payload},
-            )
+        outbox.publish(f"chat_{channel_id}", {"type": "chat_message", "message": MessageSerializer(message).data})
         sender_name = (self.request.user.get_full_name() or self.request.user.username or "").strip() or "Someone"
         channel_name = channel.name or f"Channel {channel_id}"
-        for member in channel.members.exclude(id=self.request.user.id):
-            Notification.objects.create(
-                recipient=member,
-                notification_type=Notification.TYPE_CHAT_MESSAGE,
-                title="New chat message",
-                message=f'{sender_name} sent a message in "{channel_name}".',
-                link=f"/chat?channel={channel_id}",
-                extra_data={"channel_id": channel_id, "message_id": message.id},
-            )
+        with NotificationDispatcher() as dispatcher:
+            for member_id in channel.members.exclude(id=self.request.user.id).values_list("id", flat=True):
+                dispatcher.add(
+                    member_id,
+                    Notification.TYPE_CHAT_MESSAGE,
+                    "New chat message",
+                    f'{sender_name} sent a message in "{channel_name}".',
+                    f"/chat?channel={channel_id}",
+                    {"channel_id": channel_id, "message_id": message.id, "sender_id": self.request.user.id},
+                    group_key=f"chat:{channel_id}",
+                )
@@ -1,6 +1,8 @@
 """
 Celery application for TaskFlow.
-Uses Redis as broker and result backend. Celery Beat runs check_reminders_and_deadlines every minute.
+Uses Redis as broker and result backend. Celery Beat runs check_reminders_and_deadlines every
+REMINDER_SWEEP_MINUTES (default every minute); with the precise scheduler (tasks.scheduler) running
+it is only a reconciliation sweep and can run less often.
 """
 import sys
 from celery import Celery
@@ -18,10 +20,29 @@ app.autodiscover_tasks()
 if sys.platform == "win32":
     app.conf.worker_pool = "solo"
 
-# Beat schedule: run reminder/deadline check every minute
+# Beat schedule: reminder/deadline sweep every REMINDER_SWEEP_MINUTES (read here, not from settings,
+# because this module is imported while Django settings are still loading).
+REMINDER_SWEEP_MINUTES = int(os.environ.get("REMINDER_SWEEP_MINUTES", "1"))
+
 app.conf.beat_schedule = {
     "check-reminders-and-deadlines": {
         "task": "tasks.check_reminders_and_deadlines",
-        "schedule": crontab(minute="*"),  # every minute
+        "schedule": crontab(minute="*" if REMINDER_SWEEP_MINUTES <= 1 else f"*/{REMINDER_SWEEP_MINUTES}"),
+    },
+    "prune-task-tombstones": {
+        "task": "tasks.prune_task_tombstones",
+        "schedule": crontab(hour=3, minute=15),  # daily
+    },
+    "drain-broadcast-outbox": {
+        "task": "notifications.drain_outbox",
+        "schedule": crontab(minute="*"),
+    },
+    "prune-broadcast-outbox": {
+        "task": "notifications.prune_outbox",
+        "schedule": crontab(minute=45),  # hourly
+    },
+    "manage-partitions": {
+        "task": "audit_logs.manage_partitions",
+        "schedule": crontab(hour=2, minute=30),  # daily; idempotent
     },
 }
@@ -0,0 +1,110 @@
+"""
+Conditional GET (ETag / Last-Modified / 304) for DRF generic views.
+
+Validators come from a cheap fingerprint computed before anything is serialized: for lists
+the rows of the requested page (each row's key and timestamps) plus the paginator's own state
+(total count in page-number mode, whether a next page exists in cursor mode), so nothing is
+aggregated over the whole filtered set; for detail views the loaded row's own timestamps.
+A client revalidating with a matching If-None-Match (or, for detail views,
+If-Modified-Since) gets an empty 304.
+"""
+import hashlib
+
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest())
+
+
+def etag_matches(request, etag):
+    """Weak comparison against If-None-Match (RFC 9110 13.1.2)."""
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    candidates = parse_etags(header)
+    return "*" in candidates or etag in (c.removeprefix("W/") for c in candidates)
+
+
+def not_modified(headers):
+    response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    for name, value in headers.items():
+        response[name] = value
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Mixin for ListModelMixin / RetrieveModelMixin views.
+    Lists: implement get_row_fingerprint(obj) -> tuple of the values that change the row's
+    representation (default: the pk alone, for append-only rows).
+    Detail: implement get_object_fingerprint(obj) -> tuple; optionally get_last_modified(obj).
+    The ETag also covers the user, the full query string and `etag_version` (bump it when
+    the serialized representation changes).
+    """
+    etag_version = 1
+
+    def get_row_fingerprint(self, obj):
+        return (obj.pk,)
+
+    def _page_fingerprint(self, rows):
+        paginator = getattr(self, "_paginator", None)
+        page = getattr(paginator, "page", None)
+        state = (
+            getattr(getattr(page, "paginator", None), "count", None),
+            getattr(paginator, "has_next", None),
+        )
+        return (*state, *(value for row in rows for value in self.get_row_fingerprint(row)))
+
+    def get_object_fingerprint(self, obj):
+        raise NotImplementedError
+
+    def get_last_modified(self, obj):
+        return None
+
+    def _etag(self, request, fingerprint):
+        return make_etag(
+            type(self).__name__, self.etag_version, request.user.pk, request.get_full_path(), *fingerprint
+        )
+
+    def _validator_headers(self, etag, last_modified=None):
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+        if last_modified is not None:
+            headers["Last-Modified"] = http_date(last_modified.timestamp())
+        return headers
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        etag = self._etag(request, self._page_fingerprint(rows))
+        headers = self._validator_headers(etag)
+        if etag_matches(request, etag):
+            return not_modified(headers)
+
+        if page is not None:
+            response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        else:
+            response = Response(self.get_serializer(rows, many=True).data)
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = self._etag(request, self.get_object_fingerprint(instance))
+        last_modified = self.get_last_modified(instance)
+        headers = self._validator_headers(etag, last_modified)
+        if etag_matches(request, etag):
+            return not_modified(headers)
+        if last_modified is not None and "HTTP_IF_NONE_MATCH" not in request.META:
+            since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE", ""))
+            if since is not None and int(last_modified.timestamp()) <= since:
+                return not_modified(headers)
+
+        response = Response(self.get_serializer(instance).data)
+        for name, value in headers.items():
+            response[name] = value
+        return response
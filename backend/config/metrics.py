@@ -0,0 +1,90 @@
+"""
+Hit/miss counters kept in the shared cache so every worker process contributes to the
+same totals. Read them with `python manage.py cache_metrics`.
+
+Counting happens in process: hit()/miss() only bump a local number, and the counts are
+added to the shared cache at most once every METRICS_FLUSH_SECONDS (one INCR per outcome)
+and at exit. A lookup served from a process-local cache therefore never waits on Redis
+just to be counted. The shared totals lag by up to the flush interval, and a process that
+dies without exiting cleanly loses its unflushed counts.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+OUTCOMES = ("hit", "miss")
+
+
+class HitMissCounter:
+    def __init__(self, name):
+        self.name = name
+        self._pending = dict.fromkeys(OUTCOMES, 0)
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+        _registry[name] = self
+
+    def _key(self, outcome):
+        return f"metrics:{self.name}:{outcome}"
+
+    def _incr(self, outcome):
+        with self._lock:
+            self._pending[outcome] += 1
+            due = time.monotonic() - self._flushed_at >= settings.METRICS_FLUSH_SECONDS
+        if due:
+            self.flush()
+
+    def hit(self):
+        self._incr("hit")
+
+    def miss(self):
+        self._incr("miss")
+
+    def flush(self):
+        """Add this process's pending counts to the shared totals."""
+        with self._lock:
+            pending, self._pending = self._pending, dict.fromkeys(OUTCOMES, 0)
+            self._flushed_at = time.monotonic()
+        for outcome, count in pending.items():
+            if not count:
+                continue
+            key = self._key(outcome)
+            try:
+                try:
+                    cache.incr(key, count)
+                except ValueError:  # first flush for this key
+                    if not cache.add(key, count, timeout=None):
+                        cache.incr(key, count)
+            except Exception:  # metrics must never fail a request
+                logger.debug("metrics flush failed for %s", key, exc_info=True)
+
+    def read(self):
+        """Shared totals plus this process's not-yet-flushed counts."""
+        keys = [self._key(outcome) for outcome in OUTCOMES]
+        values = cache.get_many(keys)
+        with self._lock:
+            hits, misses = (values.get(key, 0) + self._pending[outcome] for key, outcome in zip(keys, OUTCOMES))
+        total = hits + misses
+        return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else None}
+
+    def reset(self):
+        with self._lock:
+            self._pending = dict.fromkeys(OUTCOMES, 0)
+        cache.delete_many([self._key(outcome) for outcome in OUTCOMES])
+
+
+def registered_counters():
+    return dict(_registry)
+
+
+@atexit.register
+def flush_all():
+    for counter in list(_registry.values()):
+        counter.flush()
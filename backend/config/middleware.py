@@ -2,14 +2,14 @@ from urllib.parse import parse_qs
 from channels.auth import AuthMiddlewareStack
 from channels.db import database_sync_to_async
 from django.contrib.auth.models import AnonymousUser
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+from users.authentication import PermissionClaimsJWTAuthentication
 
 
 @database_sync_to_async
 def get_user_from_token(token_str):
     try:
-        auth = JWTAuthentication()
+        auth = PermissionClaimsJWTAuthentication()
         validated = auth.get_validated_token(token_str)
         return auth.get_user(validated)
     except (InvalidToken, AuthenticationFailed):
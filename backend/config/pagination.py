@@ -0,0 +1,186 @@
+"""
+Keyset (cursor) pagination, opt-in alternative to the global PageNumberPagination.
+No COUNT(*) and no OFFSET: each page is a range scan starting after the last row of the
+previous page, ordered by (field, id) so ties on the sort field stay stable.
+
+NOT NULL fields are ordered plainly (field DESC, id DESC) and sought with a row comparison,
+(field, id) < (value, pk), which a btree on (field, id) serves as one index range scan with
+LIMIT. Only nullable fields (e.g. deadline) need NULLS LAST and the expanded OR seek.
+"""
+import base64
+import json
+from datetime import date, datetime
+
+from django.db.models import BooleanField, Expression, F, Q, Value
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class RowCompare(Expression):
+    """Row-value comparison usable in filter(): RowCompare([F("a"), F("id")], "<", [Value(x), Value(1)])."""
+    conditional = True
+    output_field = BooleanField()
+
+    def __init__(self, lhs, operator, rhs):
+        super().__init__()
+        self.lhs, self.operator, self.rhs = list(lhs), operator, list(rhs)
+
+    def get_source_expressions(self):
+        return [*self.lhs, *self.rhs]
+
+    def set_source_expressions(self, exprs):
+        self.lhs, self.rhs = exprs[: len(self.lhs)], exprs[len(self.lhs):]
+
+    def as_sql(self, compiler, connection):
+        sides, params = [], []
+        for side in (self.lhs, self.rhs):
+            parts = []
+            for expr in side:
+                sql, expr_params = compiler.compile(expr)
+                parts.append(sql)
+                params.extend(expr_params)
+            sides.append(f"({', '.join(parts)})")
+        return f"{sides[0]} {self.operator} {sides[1]}", params
+
+
+class KeysetPagination(BasePagination):
+    """
+    Seek-method pagination over (ordering field, pk).
+    Subclasses set `ordering_fields` (fields clients may sort by via ?ordering=) and
+    `default_ordering`. Only the first ?ordering= term is used; NULLs always sort last.
+    Any other ?ordering= is rejected with a 400 instead of silently paging in the default order.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering_param = "ordering"
+    ordering_fields = ("created_at",)
+    default_ordering = "-created_at"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_ordering(self, request):
+        """Return (field_name, descending) from ?ordering=, falling back to default_ordering."""
+        raw = request.query_params.get(self.ordering_param, "")
+        term = raw.split(",")[0].strip() or self.default_ordering
+        if term.lstrip("-") not in self.ordering_fields:
+            raise ValidationError({
+                self.ordering_param: [
+                    f"Cursor pagination can only order by {', '.join(self.ordering_fields)}; "
+                    "use page-number pagination for other orderings."
+                ]
+            })
+        return term.lstrip("-"), term.startswith("-")
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return api_settings.PAGE_SIZE or 20
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, field, value, pk):
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        raw = json.dumps({"f": field, "v": value, "id": pk}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request, field, model_field):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            if data["f"] != field:
+                raise ValueError("cursor was issued for a different ordering")
+            value = data["v"]
+            if value is not None:
+                value = model_field.to_python(value)
+            return value, int(data["id"])
+        except (TypeError, KeyError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def seek_filter(self, field, descending, value, pk, model_field):
+        """Rows strictly after (value, pk) in (field, pk) order, NULLs last for nullable fields."""
+        if not model_field.null and value is not None:
+            return RowCompare(
+                [F(field), F("pk")],
+                "<" if descending else ">",
+                [Value(value, output_field=model_field), Value(pk)],
+            )
+        op = "lt" if descending else "gt"
+        if value is None:
+            return Q(**{f"{field}__isnull": True, f"pk__{op}": pk})
+        after = Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"pk__{op}": pk})
+        return after | Q(**{f"{field}__isnull": True})
+
+    def get_order_by(self, model_field):
+        if not model_field.null:
+            return [f"-{self.field}", "-pk"] if self.descending else [self.field, "pk"]
+        if self.descending:
+            return [F(self.field).desc(nulls_last=True), "-pk"]
+        return [F(self.field).asc(nulls_last=True), "pk"]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(request)
+        model_field = queryset.model._meta.get_field(self.field)
+
+        queryset = queryset.order_by(*self.get_order_by(model_field))
+
+        position = self.decode_cursor(request, self.field, model_field)
+        if position is not None:
+            queryset = queryset.filter(self.seek_filter(self.field, self.descending, *position, model_field))
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        last = self.page[-1]
+        cursor = self.encode_cursor(self.field, getattr(last, self.field), last.pk)
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, "page")
+        url = replace_query_param(url, "pagination", "cursor")
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class KeysetPaginationMixin:
+    """
+    Generic view mixin: switch to `keyset_pagination_class` when the client opts in with
+    ?pagination=cursor (first page) or sends a ?cursor= from a previous `next` link.
+    Without either, the view keeps its regular pagination_class.
+    """
+    keyset_pagination_class = None
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            params = self.request.query_params
+            if self.keyset_pagination_class and (
+                params.get("pagination") == "cursor" or "cursor" in params
+            ):
+                self._paginator = self.keyset_pagination_class()
+            else:
+                return super().paginator
+        return self._paginator
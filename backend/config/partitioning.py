@@ -0,0 +1,194 @@
+"""
+Monthly range partitioning (Postgres) for the append-only tables.
+
+notifications_notification and audit_logs_auditlog are partitioned by RANGE (created_at),
+one partition per calendar month named <table>_pYYYYMM, plus a DEFAULT partition that only
+catches rows outside every monthly range (it should stay empty). Postgres requires the
+partition key in the primary key, so the PK becomes (id, created_at); ids still come from a
+single sequence and stay unique. Queries bounded on created_at only touch the matching
+partitions, and retention detaches or drops whole partitions instead of running DELETE.
+
+convert_to_partitioned() is used by the migrations; ensure_partitions() and
+apply_retention() by `manage.py manage_partitions` and the audit_logs.manage_partitions
+Celery task. Everything here is a no-op on other databases.
+"""
+import logging
+from datetime import date
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def partitioned_tables():
+    """{table: retention in months (0 = keep forever)}."""
+    return {
+        "audit_logs_auditlog": settings.AUDIT_LOG_RETENTION_MONTHS,
+        "notifications_notification": settings.NOTIFICATION_RETENTION_MONTHS,
+    }
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, n):
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+
+def _is_postgres(conn):
+    return conn.vendor == "postgresql"
+
+
+def _create_partition(cursor, table, month):
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def ensure_partitions(table, months_ahead=None, conn=None):
+    """Create this month's partition and the next months_ahead ones; returns the names created or kept."""
+    conn = conn or connection
+    if not _is_postgres(conn):
+        return []
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = month_start(timezone.now())
+    months = [add_months(current, n) for n in range(months_ahead + 1)]
+    with conn.cursor() as cursor:
+        for month in months:
+            _create_partition(cursor, table, month)
+    return [partition_name(table, m) for m in months]
+
+
+def _monthly_partitions(cursor, table):
+    """[(month, partition name)] currently attached to table, oldest first."""
+    cursor.execute(
+        """
+        SELECT child.relname FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = %s
+        """,
+        [table],
+    )
+    prefix = f"{table}_p"
+    result = []
+    for (name,) in cursor.fetchall():
+        suffix = name[len(prefix):]
+        if name.startswith(prefix) and len(suffix) == 6 and suffix.isdigit():
+            result.append((date(int(suffix[:4]), int(suffix[4:]), 1), name))
+    return sorted(result)
+
+
+def apply_retention(table, retention_months, mode=None, dry_run=False, conn=None):
+    """
+    Detach (mode "detach": the table is kept for archiving) or drop (mode "drop") partitions
+    whose whole month is older than retention_months. Returns the affected partition names.
+    """
+    conn = conn or connection
+    if not _is_postgres(conn) or not retention_months:
+        return []
+    mode = mode or settings.PARTITION_RETENTION_MODE
+    cutoff = add_months(month_start(timezone.now()), -retention_months)
+    with conn.cursor() as cursor:
+        expired = [name for month, name in _monthly_partitions(cursor, table) if month < cutoff]
+        if dry_run:
+            return expired
+        for name in expired:
+            cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+            if mode == "drop":
+                cursor.execute(f"DROP TABLE {name}")
+            logger.info("%s partition %s of %s", "dropped" if mode == "drop" else "detached", name, table)
+    return expired
+
+
+def _indexes_and_foreign_keys(cursor, table):
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s",
+        [table],
+    )
+    indexes = [sql for name, sql in cursor.fetchall() if not name.endswith("_pkey")]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+        [table],
+    )
+    return indexes, cursor.fetchall()
+
+
+def _restore_indexes_and_foreign_keys(schema_editor, table, indexes, foreign_keys):
+    # indexdef was read before the rename, so it already targets the rebuilt table.
+    for sql in indexes:
+        schema_editor.execute(sql)
+    for name, definition in foreign_keys:
+        schema_editor.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+
+
+def convert_to_partitioned(schema_editor, table):
+    """
+    Rebuild table as a partitioned table in place (migration helper): copy rows into monthly
+    partitions, then recreate the indexes and foreign keys under their original names so later
+    Django migrations still find them. Takes an exclusive lock for the duration of the copy.
+    """
+    conn = schema_editor.connection
+    if not _is_postgres(conn):
+        return
+    old = f"{table}_unpartitioned"
+    with conn.cursor() as cursor:
+        indexes, foreign_keys = _indexes_and_foreign_keys(cursor, table)
+        cursor.execute(f"SELECT min(created_at), max(id) FROM {table}")
+        oldest, max_id = cursor.fetchone()
+
+    schema_editor.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    # Identity is not copied (not supported on partitioned tables before Postgres 17); the id
+    # sequence, primary key and indexes are created once the old table (and its names) is gone.
+    schema_editor.execute(
+        f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (created_at)"
+    )
+    schema_editor.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    current = month_start(timezone.now())
+    month = month_start(oldest) if oldest else current
+    last = add_months(current, settings.PARTITION_MONTHS_AHEAD)
+    with conn.cursor() as cursor:
+        while month <= last:
+            _create_partition(cursor, table, month)
+            month = add_months(month, 1)
+    schema_editor.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    schema_editor.execute(f"DROP TABLE {old}")
+
+    schema_editor.execute(f"CREATE SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    schema_editor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')")
+    if max_id is not None:
+        schema_editor.execute(f"SELECT setval('{table}_id_seq', {int(max_id)})")
+    schema_editor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, created_at)")
+    _restore_indexes_and_foreign_keys(schema_editor, table, indexes, foreign_keys)
+
+
+def convert_to_unpartitioned(schema_editor, table):
+    """Reverse of convert_to_partitioned: back to a plain table with an identity id primary key."""
+    conn = schema_editor.connection
+    if not _is_postgres(conn):
+        return
+    old = f"{table}_partitioned"
+    with conn.cursor() as cursor:
+        indexes, foreign_keys = _indexes_and_foreign_keys(cursor, table)
+        cursor.execute(f"SELECT max(id) FROM {table}")
+        (max_id,) = cursor.fetchone()
+
+    schema_editor.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    schema_editor.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING CONSTRAINTS)")
+    schema_editor.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    schema_editor.execute(f"DROP TABLE {old} CASCADE")  # partitions and the owned id sequence go with it
+
+    schema_editor.execute(f"ALTER TABLE {table} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY")
+    if max_id is not None:
+        schema_editor.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), {int(max_id)})")
+    schema_editor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+    _restore_indexes_and_foreign_keys(schema_editor, table, indexes, foreign_keys)
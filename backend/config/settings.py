@@ -26,6 +26,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_simplejwt",
     "rest_framework_simplejwt.token_blacklist",
@@ -87,7 +88,7 @@ AUTH_USER_MODEL = "users.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.PermissionClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
@@ -101,6 +102,12 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
 }
+# Embed role permission flags in access tokens so permission checks skip the role query (users.authentication).
+JWT_PERMISSION_CLAIMS = os.environ.get("JWT_PERMISSION_CLAIMS", "True").lower() == "true"
+# User+role cache for HTTP/WebSocket auth (users.cache): shared-cache TTL and the per-process LRU in front of it.
+AUTH_USER_CACHE_SECONDS = int(os.environ.get("AUTH_USER_CACHE_SECONDS", "300"))
+AUTH_USER_CACHE_LOCAL_SECONDS = int(os.environ.get("AUTH_USER_CACHE_LOCAL_SECONDS", "10"))
+AUTH_USER_CACHE_LOCAL_SIZE = int(os.environ.get("AUTH_USER_CACHE_LOCAL_SIZE", "1024"))
 
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
@@ -118,6 +125,44 @@ CHANNEL_LAYERS = {
     }
 }
 
+# Shared cache (response caches, counters). Separate Redis DB from Celery (/0) and channels (/1).
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("CACHE_REDIS_URL", REDIS_URL.replace("/0", "/2")),
+    }
+}
+# Cache hit/miss counters (config.metrics) are counted per process and added to the shared totals this often.
+METRICS_FLUSH_SECONDS = int(os.environ.get("METRICS_FLUSH_SECONDS", "10"))
+# Audit log sink (audit_logs.sink): hand batches to Celery after commit instead of inserting on the request path.
+AUDIT_LOG_ASYNC = os.environ.get("AUDIT_LOG_ASYNC", "False").lower() == "true"
+AUDIT_LOG_QUEUE = os.environ.get("AUDIT_LOG_QUEUE", "celery")
+# Monthly partitions of the audit log / notification tables (config.partitioning, Postgres only).
+# Retention is in whole months, 0 keeps everything; expired partitions are detached (kept as
+# standalone tables for archiving) or dropped depending on PARTITION_RETENTION_MODE.
+# Retention is opt-in for both tables: set e.g. NOTIFICATION_RETENTION_MONTHS=12, check what would
+# go with `python manage.py manage_partitions --dry-run`, and the monthly run applies it from then on.
+PARTITION_MONTHS_AHEAD = int(os.environ.get("PARTITION_MONTHS_AHEAD", "3"))
+PARTITION_RETENTION_MODE = os.environ.get("PARTITION_RETENTION_MODE", "detach")  # "detach" or "drop"
+AUDIT_LOG_RETENTION_MONTHS = int(os.environ.get("AUDIT_LOG_RETENTION_MONTHS", "0"))
+NOTIFICATION_RETENTION_MONTHS = int(os.environ.get("NOTIFICATION_RETENTION_MONTHS", "0"))
+# Cached unread notification count per user (notifications.unread); the TTL bounds drift.
+NOTIFICATION_UNREAD_CACHE_SECONDS = int(os.environ.get("NOTIFICATION_UNREAD_CACHE_SECONDS", "300"))
+# Coalesced chat/comment notifications: at most one immediate and one trailing "notification_updated"
+# push per notification per this many seconds (0 pushes every update).
+NOTIFICATION_COALESCE_PUSH_SECONDS = int(os.environ.get("NOTIFICATION_COALESCE_PUSH_SECONDS", "30"))
+# Broadcast outbox (notifications.outbox): the drain job sends events the in-process fast path has not
+# delivered after this many seconds; delivered rows are kept (and undeliverable ones retried) this many hours.
+NOTIFICATION_OUTBOX_GRACE_SECONDS = int(os.environ.get("NOTIFICATION_OUTBOX_GRACE_SECONDS", "30"))
+NOTIFICATION_OUTBOX_RETENTION_HOURS = int(os.environ.get("NOTIFICATION_OUTBOX_RETENTION_HOURS", "24"))
+# Per-user GET /api/tasks/ response cache; entries are versioned, so TTL only bounds memory use.
+TASK_LIST_CACHE_SECONDS = int(os.environ.get("TASK_LIST_CACHE_SECONDS", "300"))
+# GET /api/tasks/stats/ per-user cache (0 disables); short because overdue/due-today counts move with time.
+TASK_STATS_CACHE_SECONDS = int(os.environ.get("TASK_STATS_CACHE_SECONDS", "30"))
+
+# Delta sync (/api/tasks/changes/): how long removal markers are kept; older cursors must resync.
+TASK_TOMBSTONE_RETENTION_DAYS = int(os.environ.get("TASK_TOMBSTONE_RETENTION_DAYS", "30"))
+
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
@@ -153,3 +198,12 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TIME_LIMIT = 120  # seconds
+
+# Precise reminder scheduler (tasks.scheduler, `manage.py run_reminder_scheduler`): a Redis sorted
+# set of pending reminder/deadline times kept current by task writes. Enable it for the web app and
+# the scheduler process, then REMINDER_SWEEP_MINUTES (config/celery.py) can be raised so Beat's
+# check_reminders_and_deadlines only reconciles.
+REMINDER_SCHEDULER_ENABLED = os.environ.get("REMINDER_SCHEDULER_ENABLED", "False").lower() == "true"
+REMINDER_SCHEDULER_REDIS_URL = os.environ.get("REMINDER_SCHEDULER_REDIS_URL", REDIS_URL)
+# Split each reminder sweep into Celery tasks of this many claims per kind (0 = one transaction).
+REMINDER_SWEEP_CHUNK_SIZE = int(os.environ.get("REMINDER_SWEEP_CHUNK_SIZE", "0"))
@@ -0,0 +1,186 @@
+"""
+Batched notification fan-out.
+
+A NotificationDispatcher collects the notifications produced by one request or job and
+flush() writes them with a single bulk_create and publishes the pushes to the recipients'
+WebSocket groups through the broadcast outbox (notifications.outbox): recorded in the same
+transaction and delivered after commit in a batch, off the request thread.
+
+    dispatcher = NotificationDispatcher()
+    for uid in recipients:
+        dispatcher.add(uid, Notification.TYPE_TASK_ASSIGNED, "Task Assigned", message, link, {"task_id": 1})
+    dispatcher.flush()
+
+Used as a context manager it flushes on a clean exit.
+
+Coalescing: notifications added with a group_key (e.g. "chat:12" for a channel's messages)
+do not pile up. If the recipient still has an unread notification with that key, flush()
+updates it instead: count goes up, title/message/link/extra_data become the latest event's
+and last_event_at is set (created_at stays put, so the row keeps its partition and its place
+under the list cursor). Once read, the next event starts a new row. Two flushes racing on
+the same key may both insert; the next one updates the newest of them.
+
+Updates reach the recipient as "notification_updated" pushes, throttled per notification
+(i.e. per recipient and channel/task) to NOTIFICATION_COALESCE_PUSH_SECONDS: the first event
+after a quiet window is pushed at once, later ones in the window are folded into a single
+trailing push (the notifications.push_coalesced Celery task) carrying the state at that time.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from . import outbox, unread
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+COALESCED_FIELDS = ["count", "title", "message", "link", "extra_data", "last_event_at"]
+UPDATED_EVENT = "notification_updated"
+
+
+def notification_payload(notification):
+    return {
+        "id": notification.id,
+        "notification_type": notification.notification_type,
+        "title": notification.title,
+        "message": notification.message,
+        "link": notification.link,
+        "read": notification.read,
+        "created_at": str(notification.created_at),
+        "last_event_at": str(notification.last_event_at) if notification.last_event_at else None,
+        "extra_data": notification.extra_data or {},
+        "count": notification.count,
+    }
+
+
+def push_notifications(notifications, event="send_notification"):
+    """Publish saved notifications to their recipients' groups (delivered after commit)."""
+    outbox.publish_many(
+        (f"notifications_{n.recipient_id}", {"type": event, "payload": notification_payload(n)})
+        for n in notifications
+    )
+
+
+def _coalesce(pending):
+    """Split pending into (rows to insert, existing unread rows updated in place)."""
+    if not any(n.group_key for n in pending):
+        return pending, []
+    latest = {}
+    for n in pending:
+        if n.group_key:
+            previous = latest.get((n.recipient_id, n.group_key))
+            if previous is not None:
+                n.count += previous.count
+            latest[(n.recipient_id, n.group_key)] = n
+    open_rows = (
+        Notification.objects.select_for_update()
+        .filter(
+            read=False,
+            recipient_id__in={recipient_id for recipient_id, _ in latest},
+            group_key__in={group_key for _, group_key in latest},
+        )
+        .order_by("created_at", "id")
+    )
+    existing = {(row.recipient_id, row.group_key): row for row in open_rows}  # newest wins
+    now = timezone.now()
+    updated = []
+    for key, n in latest.items():
+        row = existing.get(key)
+        if row is None:
+            continue
+        row.previous_event_at = row.last_event_at or row.created_at
+        row.count += n.count
+        row.title, row.message, row.link, row.extra_data = n.title, n.message, n.link, n.extra_data
+        row.last_event_at = now
+        updated.append(row)
+    Notification.objects.bulk_update(updated, COALESCED_FIELDS)
+    inserts = [n for n in pending if not n.group_key]
+    inserts += [n for key, n in latest.items() if key not in existing]
+    return inserts, updated
+
+
+def _trailing_key(notification_id):
+    return f"notifications:push:trailing:{notification_id}"
+
+
+def push_updates(rows):
+    """Push coalesced rows: at once after a quiet window, otherwise one trailing push per window."""
+    window = settings.NOTIFICATION_COALESCE_PUSH_SECONDS
+    if not window:
+        push_notifications(rows, event=UPDATED_EVENT)
+        return
+    quiet_before = timezone.now() - timedelta(seconds=window)
+    push_notifications([r for r in rows if r.previous_event_at <= quiet_before], event=UPDATED_EVENT)
+    busy = {_trailing_key(r.id): r for r in rows if r.previous_event_at > quiet_before}
+    if not busy:
+        return
+    try:
+        scheduled = cache.get_many(list(busy))
+        trailing = {key: r for key, r in busy.items() if key not in scheduled}
+        cache.set_many({key: 1 for key in trailing}, timeout=window)
+    except Exception:
+        logger.warning("push throttle unavailable; pushing %d update(s) now", len(busy), exc_info=True)
+        push_notifications(busy.values(), event=UPDATED_EVENT)
+        return
+    if trailing:
+        rows = list(trailing.values())
+        transaction.on_commit(lambda: _schedule_trailing(rows, window))
+
+
+def _schedule_trailing(rows, window):
+    from .tasks import push_coalesced
+
+    try:
+        push_coalesced.apply_async(args=[[r.id for r in rows]], countdown=window)
+    except Exception:
+        logger.warning("task queue unavailable; pushing %d update(s) now", len(rows), exc_info=True)
+        push_notifications(rows, event=UPDATED_EVENT)
+
+
+class NotificationDispatcher:
+    def __init__(self):
+        self.pending = []
+
+    def add(self, recipient_id, notification_type, title, message="", link="", extra_data=None, group_key=""):
+        self.pending.append(
+            Notification(
+                recipient_id=recipient_id,
+                notification_type=notification_type,
+                title=title,
+                message=message,
+                link=link,
+                extra_data=extra_data or {},
+                group_key=group_key,
+            )
+        )
+
+    def extend(self, notifications):
+        self.pending.extend(notifications)
+
+    def flush(self):
+        """
+        Insert everything collected with one query (coalesced ones become one UPDATE) and
+        schedule the pushes; returns the saved rows, new and updated.
+        """
+        pending, self.pending = self.pending, []
+        if not pending:
+            return []
+        with transaction.atomic():
+            pending, updated = _coalesce(pending)
+            created = Notification.objects.bulk_create(pending) if pending else []
+        unread.notifications_created(created)
+        push_notifications(created)
+        push_updates(updated)
+        return created + updated
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        return False
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 05:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0007_coalescing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='last_event_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
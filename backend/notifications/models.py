@@ -1,5 +1,7 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 
 
 class Notification(models.Model):
@@ -28,9 +30,49 @@ class Notification(models.Model):
     read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     extra_data = models.JSONField(default=dict, blank=True)
+    # Coalescing (NotificationDispatcher): events with the same group_key for the same recipient
+    # update the open (unread) notification instead of adding rows; count is how many it covers
+    # and last_event_at when the latest arrived (null until the first coalesced event).
+    # created_at never moves: it is the partition key and the list's cursor key.
+    group_key = models.CharField(max_length=100, blank=True, default="")
+    count = models.PositiveIntegerField(default=1)
+    last_event_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["recipient", "-created_at"], name="notif_recipient_created_idx"),
+            models.Index(fields=["recipient", "read", "-created_at"], name="notif_recipient_read_idx"),
+            # Unread badge count (notifications.unread) when the cached counter is missing.
+            models.Index(fields=["recipient"], condition=Q(read=False), name="notif_unread_idx"),
+            models.Index(
+                fields=["recipient", "group_key"],
+                condition=Q(read=False) & ~Q(group_key=""),
+                name="notif_open_group_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.notification_type} to {self.recipient_id}"
+
+
+class OutboxEvent(models.Model):
+    """
+    A real-time broadcast (channel layer group send) written in the same transaction as the
+    change it announces; dispatched_at is set once it has been sent (see notifications.outbox).
+    """
+    group = models.CharField(max_length=200)
+    message = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Drain (oldest undelivered first) and expiry of undelivered events.
+            models.Index(fields=["created_at"], condition=Q(dispatched_at__isnull=True), name="outbox_pending_idx"),
+            # Pruning delivered events.
+            models.Index(fields=["dispatched_at"], name="outbox_dispatched_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.group} ({'sent' if self.dispatched_at else 'pending'})"
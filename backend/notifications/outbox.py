@@ -0,0 +1,203 @@
+"""
+Transactional outbox for real-time broadcasts (channel layer group sends).
+
+publish()/publish_many() write one OutboxEvent row per (group, message) in the caller's
+transaction, so an event exists exactly when the change it announces commits: a rolled-back
+write is never announced, and a committed one is not lost when the process dies.
+
+Delivery has two paths:
+- Fast path: after commit the events are handed to a per-process daemon thread with its own
+  event loop. It drains whatever has queued up (up to MAX_BATCH events), drops exact
+  duplicates (e.g. the same task_list_invalidate sent to a user by several requests), sends
+  the batch with one asyncio.gather and marks the delivered rows dispatched with one UPDATE.
+  Requests only pay for the INSERT and a queue put, so their latency does not depend on Redis.
+- Drain: the notifications.drain_outbox Celery Beat job sends anything still undispatched
+  NOTIFICATION_OUTBOX_GRACE_SECONDS after it was written: events of a process that exited or
+  crashed before its thread got to them, events that did not fit the in-memory queue, and
+  sends that failed (channel layer down). Rows are claimed FOR UPDATE SKIP LOCKED, so
+  concurrent drains do not double-send.
+
+Delivery is at least once (a drain can race a slow fast path); clients treat the events as
+hints. Dispatched rows are pruned after NOTIFICATION_OUTBOX_RETENTION_HOURS; events that could
+not be delivered within that time are dropped with a warning. Short-lived processes
+(management commands) and Celery tasks that publish call dispatcher.join() before returning
+so their events go out on the fast path instead of waiting for the drain.
+"""
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH = 500
+MAX_QUEUE = 10000
+JOIN_TIMEOUT = 10.0  # seconds
+
+
+async def _group_send_all(channel_layer, events):
+    """Send deduplicated [(ids, group, message)]; returns the ids of the events delivered."""
+    results = await asyncio.gather(
+        *(channel_layer.group_send(group, message) for _, group, message in events), return_exceptions=True
+    )
+    delivered = []
+    for (ids, group, _), result in zip(events, results):
+        if isinstance(result, Exception):
+            logger.warning("broadcast to %s failed; left for the outbox drain", group, exc_info=result)
+        else:
+            delivered.extend(ids)
+    return delivered
+
+
+def _dedupe(events):
+    """[(id, group, message)] -> [(ids, group, message)], one entry per distinct group and message."""
+    unique = {}
+    for pk, group, message in events:
+        key = (group, json.dumps(message, sort_keys=True, default=str))
+        if key in unique:
+            unique[key][0].append(pk)
+        else:
+            unique[key] = ([pk], group, message)
+    return list(unique.values())
+
+
+def _mark_dispatched(ids):
+    if ids:
+        OutboxEvent.objects.filter(id__in=ids).update(dispatched_at=timezone.now())
+
+
+class OutboxDispatcher:
+    """Per-process daemon thread for the fast path; see the module docstring."""
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=MAX_QUEUE)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def enqueue(self, events):
+        self._ensure_started()
+        for event in events:
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                logger.warning("broadcast queue full; event %s to %s left for the outbox drain", event[0], event[1])
+
+    def join(self, timeout=JOIN_TIMEOUT):
+        """
+        Wait until everything queued so far in this process has been sent (or failed);
+        False if that did not happen within timeout seconds (the drain sends the rest).
+        """
+        if self._pid != os.getpid():
+            return True  # nothing was queued in this process
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(
+                        "broadcast queue not drained; %d event(s) left for the outbox drain",
+                        self._queue.unfinished_tasks,
+                    )
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _ensure_started(self):
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker (Celery prefork, gunicorn): the parent's thread and queue did not come along.
+                self._queue = queue.Queue(maxsize=MAX_QUEUE)
+                self._thread = None
+            if self._thread is None or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="broadcast-outbox", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                channel_layer = get_channel_layer()
+                if channel_layer:
+                    delivered = loop.run_until_complete(_group_send_all(channel_layer, _dedupe(batch)))
+                    close_old_connections()
+                    _mark_dispatched(delivered)
+            except Exception:
+                logger.exception("broadcast outbox batch failed; left for the outbox drain")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+dispatcher = OutboxDispatcher()
+
+
+def publish_many(messages):
+    """Record (group, message) pairs in the current transaction; they are sent after it commits."""
+    messages = list(messages)
+    if not messages:
+        return
+    rows = OutboxEvent.objects.bulk_create([OutboxEvent(group=group, message=message) for group, message in messages])
+    events = [(row.id, group, message) for row, (group, message) in zip(rows, messages)]
+    transaction.on_commit(lambda: dispatcher.enqueue(events))
+
+
+def publish(group, message):
+    publish_many([(group, message)])
+
+
+def drain(limit=MAX_BATCH):
+    """Send events the fast path has not delivered within the grace period; returns how many were sent."""
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return 0
+    cutoff = timezone.now() - timedelta(seconds=settings.NOTIFICATION_OUTBOX_GRACE_SECONDS)
+    sent = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                OutboxEvent.objects.select_for_update(skip_locked=True)
+                .filter(dispatched_at__isnull=True, created_at__lt=cutoff)
+                .order_by("created_at")[:limit]
+            )
+            if not rows:
+                return sent
+            delivered = async_to_sync(_group_send_all)(
+                channel_layer, _dedupe([(row.id, row.group, row.message) for row in rows])
+            )
+            _mark_dispatched(delivered)
+        sent += len(delivered)
+        if len(rows) < limit or len(delivered) < len(rows):
+            return sent  # caught up, or the channel layer is failing: retry on the next run
+
+
+def prune():
+    """Delete delivered events and expire undelivered ones older than the retention; returns (deleted, expired)."""
+    cutoff = timezone.now() - timedelta(hours=settings.NOTIFICATION_OUTBOX_RETENTION_HOURS)
+    deleted, _ = OutboxEvent.objects.filter(dispatched_at__lt=cutoff).delete()
+    expired, _ = OutboxEvent.objects.filter(dispatched_at__isnull=True, created_at__lt=cutoff).delete()
+    if expired:
+        logger.warning("dropped %d broadcast(s) not delivered within %dh", expired, settings.NOTIFICATION_OUTBOX_RETENTION_HOURS)
+    return deleted, expired
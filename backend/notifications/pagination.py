@@ -0,0 +1,7 @@
+from config.pagination import KeysetPagination
+
+
+class NotificationKeysetPagination(KeysetPagination):
+    """Newest first over (created_at, id); opt in with ?pagination=cursor."""
+    ordering_fields = ("created_at",)
+    default_ordering = "-created_at"
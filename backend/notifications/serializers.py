@@ -14,5 +14,7 @@ class NotificationSerializer(serializers.ModelSerializer):
             "read",
             "created_at",
             "extra_data",
+            "count",
+            "last_event_at",
         ]
         read_only_fields = fields
@@ -0,0 +1,29 @@
+"""
+Celery tasks for notifications.
+"""
+from celery import shared_task
+from . import outbox
+from .dispatch import UPDATED_EVENT, push_notifications
+from .models import Notification
+
+
+@shared_task(name="notifications.push_coalesced")
+def push_coalesced(notification_ids) -> dict:
+    """Trailing push for throttled coalesced notifications (see notifications.dispatch.push_updates)."""
+    rows = list(Notification.objects.filter(id__in=notification_ids, read=False))
+    push_notifications(rows, event=UPDATED_EVENT)
+    outbox.dispatcher.join()
+    return {"pushed": len(rows)}
+
+
+@shared_task(name="notifications.drain_outbox")
+def drain_outbox() -> dict:
+    """Every minute: send broadcasts the in-process fast path did not deliver (see notifications.outbox)."""
+    return {"sent": outbox.drain()}
+
+
+@shared_task(name="notifications.prune_outbox")
+def prune_outbox() -> dict:
+    """Hourly: delete delivered broadcasts and expire undeliverable ones."""
+    deleted, expired = outbox.prune()
+    return {"deleted": deleted, "expired": expired}
@@ -0,0 +1,77 @@
+"""
+Per-user unread notification counter (GET /api/notifications/unread_count/).
+
+The count is cached under notifications:unread:{user_id}. New notifications increment it and
+mark-read decrements it, both after commit and only while the counter is cached. A missing
+counter is recomputed from the notif_unread_idx partial index (recipient WHERE read = false)
+and cached for NOTIFICATION_UNREAD_CACHE_SECONDS, which also bounds drift from a recompute
+racing a concurrent change or from retention removing old partitions.
+
+Cache failures fail open: the count is then read from the database.
+"""
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from config.metrics import HitMissCounter
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+unread_counter = HitMissCounter("notification_unread_count")
+
+
+def _key(user_id):
+    return f"notifications:unread:{user_id}"
+
+
+def unread_count(user_id):
+    try:
+        value = cache.get(_key(user_id))
+    except Exception:
+        logger.warning("unread counter read failed", exc_info=True)
+        value = None
+    if value is not None:
+        unread_counter.hit()
+        return max(value, 0)
+    unread_counter.miss()
+    value = Notification.objects.filter(recipient_id=user_id, read=False).count()
+    try:
+        cache.add(_key(user_id), value, timeout=settings.NOTIFICATION_UNREAD_CACHE_SECONDS)
+    except Exception:
+        logger.warning("unread counter write failed", exc_info=True)
+    return value
+
+
+def adjust(deltas):
+    """Apply {user_id: delta} to the cached counters; uncached users recompute on their next read."""
+    for user_id, delta in deltas.items():
+        if not delta:
+            continue
+        try:
+            cache.incr(_key(user_id), delta)
+        except ValueError:  # not cached
+            pass
+        except Exception:
+            logger.warning("unread counter update failed; dropping it", exc_info=True)
+            invalidate(user_id)
+
+
+def adjust_on_commit(deltas):
+    deltas = dict(deltas)
+    if deltas:
+        transaction.on_commit(lambda: adjust(deltas))
+
+
+def notifications_created(notifications):
+    adjust_on_commit(Counter(n.recipient_id for n in notifications if not n.read))
+
+
+def invalidate(user_id):
+    try:
+        cache.delete(_key(user_id))
+    except Exception:
+        logger.warning("unread counter delete failed", exc_info=True)
@@ -1,5 +1,10 @@
 from django.urls import path
-from .views import NotificationListView, NotificationMarkReadView, NotificationMarkAllReadView
+from .views import (
+    NotificationListView,
+    NotificationMarkReadView,
+    NotificationMarkAllReadView,
+    NotificationUnreadCountView,
+)
 
 urlpatterns = [
     path("notifications/", NotificationListView.as_view(), name="notification_list"),
@@ -9,4 +14,5 @@ urlpatterns = [
         name="notification_mark_read",
     ),
     path("notifications/mark_all_read/", NotificationMarkAllReadView.as_view(), name="notification_mark_all_read"),
+    path("notifications/unread_count/", NotificationUnreadCountView.as_view(), name="notification_unread_count"),
 ]
@@ -1,17 +1,30 @@
 from rest_framework import generics, permissions
 from rest_framework.response import Response
+from config.conditional import ConditionalGetMixin
+from config.pagination import KeysetPaginationMixin
+from . import unread
 from .models import Notification
+from .pagination import NotificationKeysetPagination
 from .serializers import NotificationSerializer
 
 
-class NotificationListView(generics.ListAPIView):
+class NotificationListView(KeysetPaginationMixin, ConditionalGetMixin, generics.ListAPIView):
+    """
+    Newest 100 notifications with page-number pagination, or the whole history with
+    ?pagination=cursor ({"next", "results"}, follow `next`; no COUNT, no OFFSET).
+    """
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    keyset_pagination_class = NotificationKeysetPagination
 
     def get_queryset(self):
-        return Notification.objects.filter(recipient=self.request.user).order_by(
-            "-created_at"
-        )[:100]
+        qs = Notification.objects.filter(recipient=self.request.user).order_by("-created_at")
+        if isinstance(self.paginator, NotificationKeysetPagination):
+            return qs
+        return qs[:100]
+
+    def get_row_fingerprint(self, obj):
+        return obj.pk, obj.read, obj.count, obj.last_event_at
 
 
 class NotificationMarkReadView(generics.UpdateAPIView):
@@ -24,8 +37,9 @@ class NotificationMarkReadView(generics.UpdateAPIView):
 
     def patch(self, request, *args, **kwargs):
         obj = self.get_object()
-        obj.read = True
-        obj.save()
+        # Conditional update so two concurrent mark-read requests decrement the counter once.
+        if Notification.objects.filter(pk=obj.pk, read=False).update(read=True):
+            unread.adjust_on_commit({request.user.pk: -1})
         return Response(status=204)
 
 
@@ -34,4 +48,13 @@ class NotificationMarkAllReadView(generics.GenericAPIView):
 
     def post(self, request):
         updated = Notification.objects.filter(recipient=request.user, read=False).update(read=True)
+        unread.adjust_on_commit({request.user.pk: -updated})
         return Response(status=204)
+
+
+class NotificationUnreadCountView(generics.GenericAPIView):
+    """Unread badge count, served from the per-user counter in notifications.unread."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response({"unread_count": unread.unread_count(request.user.pk)})
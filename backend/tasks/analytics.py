@@ -0,0 +1,149 @@
+"""
+Cycle-time analytics over TaskStatusTransition (GET /api/tasks/analytics/).
+
+Scope: tasks first finished within the window, grouped by assignee (assigned_to) or role
+(the assignee's role, else assigned_to_role). Per group:
+  - lead time: task created -> first "finished"
+  - cycle time: first "ongoing" -> first "finished"
+  - hours spent in pending / ongoing: each transition's span runs until the next one,
+    computed with LEAD() over the task's transitions
+  - weekly throughput: tasks finished per week, with a running total (SUM() OVER)
+All of it runs in the database with two statements; only group names are looked up afterwards.
+"""
+from django.db import connection
+
+from users.models import Role, User
+
+GROUP_BY_CHOICES = ("assignee", "role")
+
+# The few expressions that differ between Postgres (production) and SQLite (local dev).
+_DIALECTS = {
+    "postgresql": {
+        "seconds": "EXTRACT(EPOCH FROM ({end} - {start}))",
+        "week": "date_trunc('week', {ts})",
+    },
+    "sqlite": {
+        "seconds": "((julianday({end}) - julianday({start})) * 86400.0)",
+        "week": "date({ts}, '-6 days', 'weekday 1')",
+    },
+}
+
+_GROUP_EXPRESSIONS = {
+    "assignee": "t.assigned_to_id",
+    "role": "COALESCE(u.role_id, t.assigned_to_role_id)",
+}
+
+
+def _finished_cte(group_by, visible_sql):
+    dialect = _DIALECTS[connection.vendor]
+
+    def seconds(start, end):
+        return dialect["seconds"].format(start=start, end=end)
+
+    visibility = f"AND tr.task_id IN ({visible_sql})" if visible_sql else ""
+    return f"""
+        WITH spans AS (
+            SELECT tr.task_id, tr.to_status AS status, tr.created_at AS entered_at,
+                   LEAD(tr.created_at) OVER (PARTITION BY tr.task_id ORDER BY tr.created_at, tr.id) AS left_at
+            FROM tasks_taskstatustransition tr
+            WHERE tr.task_id IN (
+                SELECT task_id FROM tasks_taskstatustransition WHERE to_status = 'finished' AND created_at >= %s
+            ) {visibility}
+        ),
+        per_task AS (
+            SELECT task_id,
+                   MIN(CASE WHEN status = 'ongoing' THEN entered_at END) AS started_at,
+                   MIN(CASE WHEN status = 'finished' THEN entered_at END) AS finished_at,
+                   SUM(CASE WHEN status = 'pending' AND left_at IS NOT NULL
+                       THEN {seconds("entered_at", "left_at")} ELSE 0 END) AS pending_seconds,
+                   SUM(CASE WHEN status = 'ongoing' AND left_at IS NOT NULL
+                       THEN {seconds("entered_at", "left_at")} ELSE 0 END) AS ongoing_seconds
+            FROM spans
+            GROUP BY task_id
+        ),
+        finished AS (
+            SELECT p.*, {_GROUP_EXPRESSIONS[group_by]} AS group_id,
+                   {seconds("t.created_at", "p.finished_at")} AS lead_seconds,
+                   CASE WHEN p.started_at <= p.finished_at
+                        THEN {seconds("p.started_at", "p.finished_at")} END AS cycle_seconds,
+                   {dialect["week"].format(ts="p.finished_at")} AS week
+            FROM per_task p
+            JOIN tasks_task t ON t.id = p.task_id
+            LEFT JOIN users_user u ON u.id = t.assigned_to_id
+            WHERE p.finished_at >= %s
+        )
+    """
+
+
+def _hours(seconds):
+    return None if seconds is None else round(float(seconds) / 3600, 2)
+
+
+def _group_names(group_by, ids):
+    ids = [i for i in ids if i is not None]
+    if group_by == "assignee":
+        return dict(User.objects.filter(id__in=ids).values_list("id", "username"))
+    return dict(Role.objects.filter(id__in=ids).values_list("id", "name"))
+
+
+def compute_cycle_time_analytics(group_by, since, visible_ids=None):
+    """
+    group_by: "assignee" or "role"; since: window start (aware datetime).
+    visible_ids: optional task id queryset restricting the scope (non see-all users).
+    """
+    visible_sql, visible_params = ("", ())
+    if visible_ids is not None:
+        visible_sql, visible_params = visible_ids.query.sql_with_params()
+    since_param = connection.ops.adapt_datetimefield_value(since)
+    cte = _finished_cte(group_by, visible_sql)
+    params = [since_param, *visible_params, since_param]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            cte + """
+            SELECT group_id, COUNT(*), AVG(lead_seconds), AVG(cycle_seconds),
+                   AVG(pending_seconds), AVG(ongoing_seconds)
+            FROM finished
+            GROUP BY group_id
+            ORDER BY COUNT(*) DESC
+            """,
+            params,
+        )
+        group_rows = cursor.fetchall()
+        cursor.execute(
+            cte + """
+            SELECT group_id, week, finished,
+                   SUM(finished) OVER (PARTITION BY group_id ORDER BY week) AS cumulative
+            FROM (SELECT group_id, week, COUNT(*) AS finished FROM finished GROUP BY group_id, week) weekly
+            ORDER BY group_id, week
+            """,
+            params,
+        )
+        week_rows = cursor.fetchall()
+
+    names = _group_names(group_by, [row[0] for row in group_rows])
+    return {
+        "group_by": group_by,
+        "since": since.isoformat(),
+        "groups": [
+            {
+                "id": group_id,
+                "name": names.get(group_id),
+                "finished": finished,
+                "avg_lead_time_hours": _hours(lead),
+                "avg_cycle_time_hours": _hours(cycle),
+                "avg_hours_pending": _hours(pending),
+                "avg_hours_ongoing": _hours(ongoing),
+            }
+            for group_id, finished, lead, cycle, pending, ongoing in group_rows
+        ],
+        "weekly_throughput": [
+            {
+                "id": group_id,
+                "week": week.date().isoformat() if hasattr(week, "date") else str(week),
+                "finished": finished,
+                "cumulative": int(cumulative),
+            }
+            for group_id, week, finished, cumulative in week_rows
+        ],
+    }
@@ -0,0 +1,159 @@
+"""
+Bulk task operations (POST /api/tasks/bulk/).
+
+Each action runs in one transaction: rows are written with bulk_create/bulk_update, audit
+rows and notifications are collected and written in one batch each (audit_logs.sink,
+NotificationDispatcher), and the task_list_invalidate broadcast is sent once per affected
+user. Mirrors the side effects of the single-task create/update/delete paths in views.py.
+"""
+from django.utils import timezone
+
+from audit_logs import sink as audit
+from audit_logs.models import AuditLog
+from notifications.models import Notification
+from .models import Task, TaskStatusTransition
+from .visibility import task_audiences
+
+
+def _notification(uid, task, notification_type):
+    if notification_type == Notification.TYPE_TASK_ASSIGNED:
+        title, message = "Task Assigned", f'You were assigned to task "{task.title}"'
+    else:
+        title, message = "Task Updated", f'Task "{task.title}" was updated.'
+    return Notification(
+        recipient_id=uid,
+        notification_type=notification_type,
+        title=title,
+        message=message,
+        link=f"/tasks/{task.id}",
+        extra_data={"task_id": task.id},
+    )
+
+
+def _audit(user, action, task_id, changes):
+    return audit.entry(user, action, "task", task_id, changes)
+
+
+class BulkResult:
+    """Side effects collected while applying one bulk action."""
+
+    def __init__(self):
+        self.task_ids = []
+        self.audit_rows = []
+        self.transitions = []
+        self.notifications = []
+        self.affected_user_ids = set()
+        # Delta sync tombstones: deleted task ids, and {task_id: user ids that lost visibility}.
+        self.removed_task_ids = []
+        self.hidden = {}
+
+
+def bulk_create_tasks(user, items):
+    """items: validated TaskBulkItemSerializer data dicts (assignees as user ids)."""
+    result = BulkResult()
+    now = timezone.now()
+    tasks, assignee_lists = [], []
+    for item in items:
+        item = dict(item)
+        assignees = item.pop("assignees", None) or []
+        item.pop("assigned_to", None)
+        if assignees:
+            item["assigned_to_id"] = assignees[0]
+            item["assigned_to_role"] = None
+        tasks.append(Task(created_by=user, created_at=now, updated_at=now, **item))
+        assignee_lists.append(assignees)
+    tasks = Task.objects.bulk_create(tasks)
+
+    Through = Task.assignees.through
+    Through.objects.bulk_create(
+        [Through(task_id=task.id, user_id=uid) for task, assignees in zip(tasks, assignee_lists) for uid in assignees],
+        ignore_conflicts=True,
+    )
+    result.affected_user_ids.add(user.id)
+    for task, assignees in zip(tasks, assignee_lists):
+        result.task_ids.append(task.id)
+        # bulk_create skips post_save, so add the audit row and transition tasks.signals would write.
+        result.audit_rows.append(
+            _audit(user, AuditLog.ACTION_CREATE, task.id, {"title": task.title, "status": task.status})
+        )
+        result.transitions.append(TaskStatusTransition(task_id=task.id, to_status=task.status, changed_by=user))
+        for uid in set(assignees):
+            result.affected_user_ids.add(uid)
+            if uid != user.id:
+                result.notifications.append(_notification(uid, task, Notification.TYPE_TASK_ASSIGNED))
+    return result
+
+
+def bulk_update_field(user, tasks, field, value):
+    """Status or priority change on already-loaded, visible tasks."""
+    result = BulkResult()
+    now = timezone.now()
+    changed = [t for t in tasks if getattr(t, field) != value]
+    audiences = task_audiences(changed)
+    assignees = task_audiences(changed, include_creator=False) if field == "priority" else {}
+    for task in changed:
+        previous = getattr(task, field)
+        setattr(task, field, value)
+        task.updated_at = now
+        result.task_ids.append(task.id)
+        result.affected_user_ids |= audiences[task.id]
+        if field == "status":
+            result.audit_rows.append(
+                _audit(user, AuditLog.ACTION_STATUS, task.id, {"status": value, "previous": previous})
+            )
+            result.transitions.append(
+                TaskStatusTransition(task_id=task.id, from_status=previous, to_status=value, changed_by=user)
+            )
+        else:
+            result.audit_rows.append(_audit(user, AuditLog.ACTION_UPDATE, task.id, {"title": task.title}))
+            for uid in assignees[task.id] - {user.id}:
+                result.notifications.append(_notification(uid, task, Notification.TYPE_TASK_UPDATED))
+    Task.objects.bulk_update(changed, [field, "updated_at"])
+    result.affected_user_ids.add(user.id)
+    return result
+
+
+def bulk_reassign(user, tasks, assignees):
+    """Replace assignees (first becomes assigned_to) on already-loaded, visible tasks."""
+    result = BulkResult()
+    now = timezone.now()
+    new_ids = [a.id for a in assignees]
+    old_audiences = task_audiences(tasks)
+    Through = Task.assignees.through
+    old_assignees = {t.id: set() for t in tasks}
+    for task_id, uid in Through.objects.filter(task_id__in=old_assignees).values_list("task_id", "user_id"):
+        old_assignees[task_id].add(uid)
+
+    Through.objects.filter(task_id__in=old_assignees).delete()
+    Through.objects.bulk_create([Through(task_id=t.id, user_id=uid) for t in tasks for uid in new_ids])
+    for task in tasks:
+        previous = old_assignees[task.id]
+        task.assigned_to_id = new_ids[0] if new_ids else None
+        task.assigned_to_role = None
+        task.updated_at = now
+        result.task_ids.append(task.id)
+        result.affected_user_ids |= old_audiences[task.id] | set(new_ids)
+        lost = old_audiences[task.id] - set(new_ids) - {task.created_by_id}
+        if lost:
+            result.hidden[task.id] = lost
+        result.audit_rows.append(
+            _audit(user, AuditLog.ACTION_ASSIGN, task.id, {"assignees": new_ids, "previous": sorted(previous)})
+        )
+        for uid in set(new_ids) - previous:
+            result.notifications.append(_notification(uid, task, Notification.TYPE_TASK_ASSIGNED))
+    Task.objects.bulk_update(tasks, ["assigned_to", "assigned_to_role", "updated_at"])
+    result.affected_user_ids.add(user.id)
+    return result
+
+
+def bulk_delete(user, tasks):
+    result = BulkResult()
+    audiences = task_audiences(tasks)
+    for task in tasks:
+        result.task_ids.append(task.id)
+        result.affected_user_ids |= audiences[task.id]
+        result.audit_rows.append(_audit(user, AuditLog.ACTION_DELETE, task.id, {"title": task.title}))
+    Task.objects.filter(id__in=result.task_ids).delete()
+    result.removed_task_ids = list(result.task_ids)
+    result.affected_user_ids.add(user.id)
+    return result
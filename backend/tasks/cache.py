@@ -0,0 +1,111 @@
+"""
+Per-user response cache for GET /api/tasks/.
+
+Entries are keyed on the user, the full query string and a version counter:
+non-staff users get a per-user counter, users who can see every task share one global
+counter. invalidate_task_lists(user_ids) bumps the given users' counters and the global
+one, so every entry they could have cached stops being addressed; old entries simply
+expire. Called from the same places that broadcast task_list_invalidate.
+
+Cache failures fail open: a Redis outage means cache misses, never failed requests.
+"""
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from config.metrics import HitMissCounter
+from .models import ACTIVE_STATUSES
+
+logger = logging.getLogger(__name__)
+
+task_list_counter = HitMissCounter("task_list_cache")
+
+GLOBAL_VERSION_KEY = "tasks:list:ver:all"
+
+
+def _user_version_key(user_id):
+    return f"tasks:list:ver:{user_id}"
+
+
+def _initial_version():
+    # Time-based seed: if a version key is evicted, the new counter cannot collide with old entries.
+    return int(time.time() * 1000)
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def versioned_key(prefix, user_id, sees_all, suffix=""):
+    """Key that changes whenever the user's task lists are invalidated; None when the cache is unavailable."""
+    scope = GLOBAL_VERSION_KEY if sees_all else _user_version_key(user_id)
+    try:
+        version = _get_version(scope)
+    except Exception:
+        logger.warning("task cache version read failed", exc_info=True)
+        return None
+    return f"{prefix}:{version}:{user_id}:{suffix}"
+
+
+def cache_key(request, sees_all):
+    """Versioned key for this list request, or None when the cache is unavailable."""
+    path_hash = hashlib.sha1(request.get_full_path().encode()).hexdigest()
+    return versioned_key("tasks:list", request.user.pk, sees_all, path_hash)
+
+
+def get_entry(key):
+    try:
+        entry = cache.get(key)
+    except Exception:
+        logger.warning("task list cache read failed", exc_info=True)
+        return None
+    if entry is None:
+        task_list_counter.miss()
+    else:
+        task_list_counter.hit()
+    return entry
+
+
+def set_entry(key, data, headers):
+    timeout = _timeout_for(data)
+    if timeout <= 0:
+        return
+    try:
+        cache.set(key, {"data": data, "headers": headers}, timeout=timeout)
+    except Exception:
+        logger.warning("task list cache write failed", exc_info=True)
+
+
+def _timeout_for(data):
+    """TTL, shortened so no cached row can miss its is_overdue flip at an upcoming deadline."""
+    timeout = settings.TASK_LIST_CACHE_SECONDS
+    rows = data.get("results", []) if isinstance(data, dict) else data
+    now = timezone.now()
+    for row in rows:
+        if "is_overdue" in row and "deadline" not in row:
+            # Sparse fieldset without the deadline: cannot predict the flip, keep entries short.
+            return min(timeout, 60)
+        deadline = parse_datetime(row["deadline"]) if row.get("deadline") else None
+        if deadline and deadline > now and row.get("status", "pending") in ACTIVE_STATUSES:
+            timeout = min(timeout, int((deadline - now).total_seconds()) + 1)
+    return timeout
+
+
+def invalidate_task_lists(user_ids):
+    """Bump the list cache version of each user (and the shared see-all version)."""
+    keys = [GLOBAL_VERSION_KEY] + [_user_version_key(uid) for uid in {u for u in user_ids if u}]
+    for key in keys:
+        try:
+            if not cache.add(key, _initial_version(), timeout=None):
+                cache.incr(key)
+        except Exception:
+            logger.warning("task list cache invalidation failed for %s", key, exc_info=True)
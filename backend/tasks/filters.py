@@ -1,13 +1,19 @@
 from django_filters.rest_framework import FilterSet
-from django_filters import NumberFilter
-from .models import Task
+from django_filters import BooleanFilter, NumberFilter
+from .models import Task, overdue_q
 
 
 class TaskFilter(FilterSet):
     """Explicit filters so assigned_to/created_by only accept numeric IDs (avoid User instance passed to id)."""
     assigned_to = NumberFilter(field_name="assigned_to_id")
     created_by = NumberFilter(field_name="created_by_id")
+    overdue = BooleanFilter(method="filter_overdue")
 
     class Meta:
         model = Task
-        fields = ["status", "priority", "assigned_to", "created_by"]
+        fields = ["status", "priority", "assigned_to", "created_by", "overdue"]
+
+    def filter_overdue(self, queryset, name, value):
+        if value is None:
+            return queryset
+        return queryset.filter(overdue_q()) if value else queryset.exclude(overdue_q())
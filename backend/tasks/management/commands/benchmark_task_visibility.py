@@ -0,0 +1,109 @@
+"""
+Benchmark the task list visibility query: legacy OR-across-join + DISTINCT versus the
+UNION-of-ids engine in tasks.visibility. Seeds synthetic users/tasks inside a transaction
+that is rolled back afterwards (unless --keep), so it is safe to run against a dev database.
+
+    python manage.py benchmark_task_visibility --seed 100000 --users 500
+"""
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from tasks.models import Task
+from tasks.views import _task_queryset_base, _visible_tasks
+from users.models import User
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Time the task list visibility query (legacy OR+DISTINCT vs UNION engine) at seeded scale."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=100000, help="Synthetic tasks to create (0 = use existing data).")
+        parser.add_argument("--users", type=int, default=500, help="Synthetic users to spread tasks across.")
+        parser.add_argument("--repeat", type=int, default=7, help="Timed runs per query.")
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--keep", action="store_true", help="Commit the seeded rows instead of rolling back.")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                users = self._seed(options["seed"], options["users"]) if options["seed"] else list(
+                    User.objects.filter(is_staff=False, is_superuser=False)[:50]
+                )
+                if not users:
+                    self.stderr.write("No non-staff users to benchmark with.")
+                    return
+                self._run(users, options["repeat"], options["page_size"])
+                if not options["keep"]:
+                    raise _Rollback
+        except _Rollback:
+            self.stdout.write("Seeded rows rolled back.")
+
+    def _seed(self, n_tasks, n_users):
+        self.stdout.write(f"Seeding {n_users} users and {n_tasks} tasks...")
+        users = User.objects.bulk_create(
+            [User(username=f"bench_user_{i}", email=f"bench_user_{i}@bench.invalid") for i in range(n_users)]
+        )
+        rng = random.Random(42)
+        statuses = ["pending", "ongoing", "finished", "cancelled"]
+        priorities = ["low", "medium", "high", "urgent"]
+        Through = Task.assignees.through
+        batch = 5000
+        for start in range(0, n_tasks, batch):
+            tasks = Task.objects.bulk_create(
+                [
+                    Task(
+                        title=f"Bench task {i}",
+                        created_by=rng.choice(users),
+                        assigned_to=rng.choice(users) if rng.random() < 0.7 else None,
+                        status=rng.choice(statuses),
+                        priority=rng.choice(priorities),
+                    )
+                    for i in range(start, min(start + batch, n_tasks))
+                ]
+            )
+            links = []
+            for task in tasks:
+                for user in rng.sample(users, rng.randint(0, 3)):
+                    links.append(Through(task_id=task.id, user_id=user.id))
+            Through.objects.bulk_create(links, ignore_conflicts=True)
+        return users
+
+    def _time(self, fn, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
+
+    def _run(self, users, repeat, page_size):
+        user = max(users[:50], key=lambda u: Task.objects.filter(created_by=u).count())
+
+        def legacy():
+            return _task_queryset_base().filter(
+                Q(created_by=user) | Q(assigned_to=user) | Q(assignees=user)
+            ).distinct()
+
+        def engine():
+            return _visible_tasks(user)
+
+        rows = [
+            ("first page", lambda qs: list(qs().order_by("-created_at")[:page_size])),
+            ("deep page (offset 2000)", lambda qs: list(qs().order_by("-created_at")[2000:2000 + page_size])),
+            ("count", lambda qs: qs().count()),
+        ]
+        self.stdout.write(f"Visible tasks for {user.username}: {engine().count()} (median of {repeat} runs)")
+        self.stdout.write(f"{'query':<26}{'legacy ms':>12}{'engine ms':>12}")
+        for label, run in rows:
+            legacy_ms = self._time(lambda: run(legacy), repeat)
+            engine_ms = self._time(lambda: run(engine), repeat)
+            self.stdout.write(f"{label:<26}{legacy_ms:>12.1f}{engine_ms:>12.1f}")
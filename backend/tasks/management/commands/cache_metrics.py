@@ -0,0 +1,24 @@
+"""
+Print hit/miss counters of the application caches (shared across all worker processes).
+"""
+from django.core.management.base import BaseCommand
+
+from config.metrics import registered_counters
+import tasks.cache  # noqa: F401  (registers task_list_cache)
+import users.cache  # noqa: F401  (registers auth_user_cache)
+import notifications.unread  # noqa: F401  (registers notification_unread_count)
+
+
+class Command(BaseCommand):
+    help = "Show cache hit/miss counters and hit rates."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Reset the counters after printing.")
+
+    def handle(self, *args, **options):
+        for name, counter in sorted(registered_counters().items()):
+            stats = counter.read()
+            rate = "n/a" if stats["hit_rate"] is None else f"{stats['hit_rate']:.1%}"
+            self.stdout.write(f"{name}: {stats['hits']} hits, {stats['misses']} misses, hit rate {rate}")
+            if options["reset"]:
+                counter.reset()
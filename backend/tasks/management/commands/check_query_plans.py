@@ -0,0 +1,341 @@
+"""
+Query-plan regression check for the hot-path indexes (Postgres only).
+
+Seeds synthetic rows at scale inside a transaction, runs ANALYZE, then drives the hot
+paths through the real code (API requests through the views, filters and paginators, and
+the reminder sweep functions), captures the SQL they issue and EXPLAINs each statement on
+the table it should reach through an index. Fails (non-zero exit) if any plans a sequential
+scan there. Checking the captured SQL instead of hand-written querysets keeps the check in
+step with the views. Caches are disabled while it runs so every request reaches the
+database. Everything is rolled back afterwards, so it can run against a dev/staging
+database or in CI:
+
+    python manage.py check_query_plans --scale 50000
+"""
+import json
+import random
+import re
+from datetime import timedelta
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework import permissions
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from audit_logs.models import AuditLog
+from chat.models import Channel, Message
+from notifications.models import Notification
+from tasks.models import Task, TaskComment, TaskStatusTransition
+from tasks.reminders import claim_due_tasks, count_due
+from tasks.views import TaskListCreateView
+from users.models import Role, User
+
+NO_CACHE = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _on_table(relation, tables):
+    # Partitions of the monthly-partitioned tables (config.partitioning) count as their parent.
+    return any(relation == t or relation.startswith(f"{t}_p") or relation == f"{t}_default" for t in tables)
+
+
+def _seq_scans(plan, tables):
+    """Yield relation names of Seq Scan nodes on `tables` anywhere in an EXPLAIN (FORMAT JSON) plan."""
+    if plan.get("Node Type") == "Seq Scan" and _on_table(plan.get("Relation Name") or "", tables):
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child, tables)
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the SQL the hot paths issue at seeded scale and fail on sequential scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=50000, help="Rows to seed per hot table.")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan, not just failures.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("check_query_plans requires PostgreSQL.")
+        failures = []
+        try:
+            with transaction.atomic(), override_settings(CACHES=NO_CACHE, ALLOWED_HOSTS=["testserver"]):
+                fixtures = self._seed(options["scale"])
+                with connection.cursor() as cursor:
+                    for table in ("tasks_task", "tasks_task_assignees", "tasks_taskcomment", "tasks_taskstatustransition",
+                                  "notifications_notification", "audit_logs_auditlog", "chat_message"):
+                        cursor.execute(f"ANALYZE {table}")
+                for label, run, tables in self._hot_paths(**fixtures):
+                    # A check names its main table, or (main table, other tables its plan must index).
+                    tables = (tables,) if isinstance(tables, str) else tables
+                    table = tables[0]
+                    statements = self._capture(run, table)
+                    if not statements:
+                        self.stdout.write(f"[FAIL] {label}: issued no query on {table}")
+                        failures.append(label)
+                        continue
+                    for i, sql in enumerate(statements, 1):
+                        name = label if len(statements) == 1 else f"{label} [query {i}]"
+                        plan = self._explain(sql)
+                        scans = list(_seq_scans(plan, set(tables)))
+                        self.stdout.write(f"[{'FAIL' if scans else 'ok'}] {name}")
+                        if scans or options["verbose_plans"]:
+                            self.stdout.write(sql)
+                            self.stdout.write(json.dumps(plan, indent=2))
+                        if scans:
+                            failures.append(name)
+                raise _Rollback
+        except _Rollback:
+            pass
+        if failures:
+            raise CommandError(f"Sequential scans in {len(failures)} hot query plan(s): {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All hot query plans use indexes."))
+
+    def _capture(self, run, table):
+        """SQL of the statements run() issues that read or claim rows of table."""
+        mentions = re.compile(rf"(?<!\w){table}(?!\w)")
+        with CaptureQueriesContext(connection) as ctx:
+            run()
+        return [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].lstrip().upper().startswith(("SELECT", "UPDATE", "WITH")) and mentions.search(q["sql"])
+        ]
+
+    def _explain(self, sql):
+        # Plain EXPLAIN only plans the statement, so captured UPDATEs are not re-run.
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = cursor.fetchone()[0]
+        return (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+
+    def _get(self, user, path, follow_next=False):
+        """Request path as user through the full view stack (and its next page when asked)."""
+        def run():
+            client = APIClient()
+            client.force_authenticate(user)
+            response = client.get(path)
+            if response.status_code != 200:
+                raise CommandError(f"GET {path} returned {response.status_code}")
+            if follow_next and response.data.get("next"):
+                client.get(response.data["next"])
+        return run
+
+    def _post(self, user, path, data):
+        def run():
+            client = APIClient()
+            client.force_authenticate(user)
+            response = client.post(path, data, format="json")
+            if response.status_code != 200:
+                raise CommandError(f"POST {path} returned {response.status_code}: {response.data}")
+        return run
+
+    def _list_without_view_permission(self, view_class, user, path, follow_next=False):
+        """
+        GET path through view_class with TaskPermissions swapped for IsAuthenticated. Listing
+        requires can_view_tasks, which also grants see-all, so over HTTP the list never runs
+        the visibility-filtered query (tasks.visibility); this drives the view's own queryset,
+        filters and paginator for a limited user so that plan is checked too.
+        """
+        view = view_class.as_view(permission_classes=[permissions.IsAuthenticated])
+        factory = APIRequestFactory()
+
+        def run():
+            url = path
+            for _ in range(2 if follow_next else 1):
+                request = factory.get(url)
+                force_authenticate(request, user)
+                response = view(request)
+                if response.status_code != 200:
+                    raise CommandError(f"GET {url} returned {response.status_code}")
+                url = response.data.get("next")
+                if not url:
+                    break
+        return run
+
+    def _hot_paths(self, user, limited, limited_task_ids, staff, task, channel):
+        now = timezone.now()
+        recent = urlencode({"created_at__gte": (now - timedelta(days=7)).isoformat()})
+        return [
+            (
+                "task list, cursor pages (TaskListCreateView)",
+                self._get(user, "/api/tasks/?pagination=cursor", follow_next=True),
+                "tasks_task",
+            ),
+            (
+                "task list, visibility-filtered, cursor pages (TaskListCreateView, limited role)",
+                self._list_without_view_permission(
+                    TaskListCreateView, limited, "/api/tasks/?pagination=cursor", follow_next=True
+                ),
+                ("tasks_task", "tasks_task_assignees"),
+            ),
+            (
+                "task list, visibility-filtered, page numbers (TaskListCreateView, limited role)",
+                self._list_without_view_permission(TaskListCreateView, limited, "/api/tasks/"),
+                ("tasks_task", "tasks_task_assignees"),
+            ),
+            (
+                "bulk update of visible tasks (TaskBulkView, limited role)",
+                self._post(limited, "/api/tasks/bulk/", {"action": "priority", "ids": limited_task_ids, "priority": "high"}),
+                ("tasks_task", "tasks_task_assignees"),
+            ),
+            (
+                "tasks by status ordered by deadline, cursor pages (TaskListCreateView)",
+                self._get(user, "/api/tasks/?pagination=cursor&status=ongoing&ordering=deadline", follow_next=True),
+                "tasks_task",
+            ),
+            (
+                "notification list (NotificationListView)",
+                self._get(user, "/api/notifications/"),
+                "notifications_notification",
+            ),
+            (
+                "notification list, cursor pages (NotificationListView)",
+                self._get(user, "/api/notifications/?pagination=cursor", follow_next=True),
+                "notifications_notification",
+            ),
+            (
+                "unread count, counter not cached (NotificationUnreadCountView)",
+                self._get(user, "/api/notifications/unread_count/"),
+                "notifications_notification",
+            ),
+            (
+                "task status history (TaskStatusHistoryView)",
+                self._get(user, f"/api/tasks/{task.id}/status_history/"),
+                "tasks_taskstatustransition",
+            ),
+            (
+                "own audit log pages (AuditLogListView, non-staff)",
+                self._get(user, "/api/audit-logs/", follow_next=True),
+                "audit_logs_auditlog",
+            ),
+            (
+                "audit log pages, recent range (AuditLogListView, staff)",
+                self._get(staff, f"/api/audit-logs/?{recent}", follow_next=True),
+                "audit_logs_auditlog",
+            ),
+            (
+                "audit log by object_id (AuditLogListView, staff)",
+                self._get(staff, f"/api/audit-logs/?object_id={task.id}"),
+                "audit_logs_auditlog",
+            ),
+            (
+                "channel messages (MessageListCreateView)",
+                self._get(user, f"/api/channels/{channel.id}/messages/"),
+                "chat_message",
+            ),
+            (
+                "task comments (TaskCommentListCreateView)",
+                self._get(user, f"/api/tasks/{task.id}/comments/"),
+                "tasks_taskcomment",
+            ),
+            ("reminder sweep: due counts (count_due)", lambda: count_due(now), "tasks_task"),
+            # Claims mark rows; they run last and are rolled back with everything else.
+            (
+                "reminder sweep: claim chunk (claim_due_tasks)",
+                lambda: claim_due_tasks("reminder_datetime", "reminder_sent_at", now, 500),
+                "tasks_task",
+            ),
+            (
+                "deadline sweep: claim chunk (claim_due_tasks)",
+                lambda: claim_due_tasks("deadline", "deadline_notified_at", now, 500),
+                "tasks_task",
+            ),
+        ]
+
+    def _seed(self, scale):
+        self.stdout.write(f"Seeding ~{scale} rows per hot table...")
+        rng = random.Random(7)
+        now = timezone.now()
+        viewer = Role.objects.create(name="plan_check_viewer", can_view_tasks=True)
+        # Without can_view_tasks the user only sees tasks they created or are assigned to.
+        limited = Role.objects.create(name="plan_check_limited", can_view_tasks=False, can_edit_tasks=True)
+        users = User.objects.bulk_create(
+            [
+                User(username=f"plan_user_{i}", email=f"plan_user_{i}@plan.invalid", role=limited if i == 1 else viewer)
+                for i in range(200)
+            ]
+        )
+        staff = User.objects.create(username="plan_staff", email="plan_staff@plan.invalid", is_staff=True)
+        statuses = ["pending", "ongoing", "finished", "cancelled"]
+        tasks = Task.objects.bulk_create(
+            [
+                Task(
+                    title=f"Plan task {i}",
+                    # The limited user (users[1]) owns a few, so its bulk update has rows to lock.
+                    created_by=users[1] if i < 50 else rng.choice(users),
+                    assigned_to=rng.choice(users),
+                    # Mostly closed tasks, like a real tracker after a while.
+                    status=rng.choices(statuses, weights=[5, 5, 80, 10])[0],
+                    deadline=now + timedelta(hours=rng.randint(-5000, 5000)),
+                    reminder_datetime=now + timedelta(hours=rng.randint(-5000, 5000)),
+                )
+                for i in range(scale)
+            ],
+            batch_size=5000,
+        )
+        co_assignments = {(rng.choice(tasks).id, rng.choice(users).id) for _ in range(scale)}
+        Task.assignees.through.objects.bulk_create(
+            [Task.assignees.through(task_id=task_id, user_id=user_id) for task_id, user_id in co_assignments],
+            batch_size=5000,
+        )
+        TaskStatusTransition.objects.bulk_create(
+            [
+                TaskStatusTransition(
+                    task=rng.choice(tasks),
+                    from_status="pending",
+                    to_status=rng.choice(statuses[1:]),
+                    changed_by=rng.choice(users),
+                )
+                for _ in range(scale)
+            ],
+            batch_size=5000,
+        )
+        Notification.objects.bulk_create(
+            [
+                Notification(
+                    recipient=rng.choice(users),
+                    notification_type=Notification.TYPE_TASK_UPDATED,
+                    title="Task Updated",
+                    read=rng.random() < 0.8,
+                )
+                for _ in range(scale)
+            ],
+            batch_size=5000,
+        )
+        AuditLog.objects.bulk_create(
+            [
+                AuditLog(
+                    user=rng.choice(users),
+                    action=AuditLog.ACTION_STATUS,
+                    model_name="task",
+                    object_id=rng.choice(tasks).id,
+                )
+                for _ in range(scale)
+            ],
+            batch_size=5000,
+        )
+        channels = Channel.objects.bulk_create([Channel(name=f"plan_{i}") for i in range(200)])
+        channels[0].members.add(users[0])
+        Message.objects.bulk_create(
+            [Message(channel=rng.choice(channels), sender=rng.choice(users), content="x") for _ in range(scale)],
+            batch_size=5000,
+        )
+        TaskComment.objects.bulk_create(
+            [TaskComment(task=rng.choice(tasks), author=rng.choice(users), body="x") for _ in range(scale)],
+            batch_size=5000,
+        )
+        limited_task_ids = [t.id for t in tasks if users[1].id in (t.created_by_id, t.assigned_to_id)][:50]
+        return {
+            "user": users[0],
+            "limited": users[1],
+            "limited_task_ids": limited_task_ids,
+            "staff": staff,
+            "task": tasks[0],
+            "channel": channels[0],
+        }
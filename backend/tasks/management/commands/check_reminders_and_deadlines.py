@@ -3,6 +3,7 @@ Run periodically (e.g. every minute via cron) to create notifications for remind
 With Redis/Celery in place, prefer using Celery Beat instead; this command remains for manual runs and dry-run.
 """
 from django.core.management.base import BaseCommand
+from notifications import outbox
 from tasks.reminders import process_reminders_and_deadlines
 
 
@@ -15,12 +16,34 @@ class Command(BaseCommand):
             action="store_true",
             help="Only print what would be done.",
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=0,
+            help="Claim at most this many tasks per kind per transaction, repeating until drained.",
+        )
 
     def handle(self, *args, **options):
         dry_run = options["dry_run"]
-        reminders_created, deadlines_created = process_reminders_and_deadlines(dry_run=dry_run)
+        chunk_size = options["chunk_size"]
+        if chunk_size and not dry_run:
+            reminders_created = deadlines_created = 0
+            while True:
+                result = process_reminders_and_deadlines(limit=chunk_size)
+                reminders_created += result.reminders
+                deadlines_created += result.deadlines
+                # Loop on claimed rows, not notifications: tasks without a recipient are claimed but not notified.
+                if result.reminders_claimed < chunk_size and result.deadlines_claimed < chunk_size:
+                    break
+        else:
+            reminders_created, deadlines_created, *_ = process_reminders_and_deadlines(dry_run=dry_run)
+        # The pushes are queued in this process; deliver them before the command exits.
+        outbox.dispatcher.join()
         if dry_run:
-            self.stdout.write("Dry run: no notifications created.")
+            self.stdout.write(
+                f"Dry run: {reminders_created} reminder(s) and {deadlines_created} deadline(s) due; "
+                "no notifications created."
+            )
         else:
             self.stdout.write(
                 self.style.SUCCESS(
@@ -0,0 +1,43 @@
+"""
+Long-running process that fires reminders and deadlines when they come due (tasks.scheduler).
+Run one instance next to Celery Beat; Beat's check_reminders_and_deadlines stays as the
+reconciliation sweep.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from notifications import outbox
+from tasks import scheduler
+
+
+class Command(BaseCommand):
+    help = "Fire reminder/deadline notifications exactly when due, from the Redis schedule."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-sleep",
+            type=float,
+            default=60.0,
+            help="Longest wait between checks in seconds, even when nothing is scheduled (default 60).",
+        )
+        parser.add_argument(
+            "--rebuild-only",
+            action="store_true",
+            help="Reload the schedule from the database and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.REMINDER_SCHEDULER_ENABLED:
+            raise CommandError(
+                "REMINDER_SCHEDULER_ENABLED is off, so task writes do not update the schedule. "
+                "Enable it for the web app and this process."
+            )
+        if options["rebuild_only"]:
+            self.stdout.write(self.style.SUCCESS(f"Scheduled {scheduler.rebuild()} task(s)."))
+            return
+        self.stdout.write("Reminder scheduler running; Ctrl+C to stop.")
+        try:
+            scheduler.run(max_sleep=options["max_sleep"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            outbox.dispatcher.join()
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.30 on 2026-10-18 05:07
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Postgres only: the trigger keeps search_vector in sync on INSERT and on UPDATE of
+# title/description; GIN indexes back ranked full-text (@@) and fuzzy title (%) matching.
+# Other databases keep the column unused and TaskSearchFilter falls back to ILIKE.
+FORWARD_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION tasks_task_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER tasks_task_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON tasks_task
+    FOR EACH ROW EXECUTE PROCEDURE tasks_task_search_vector_update();
+    """,
+    """
+    UPDATE tasks_task SET search_vector =
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B');
+    """,
+    "CREATE INDEX tasks_task_search_vector_gin ON tasks_task USING gin (search_vector);",
+    "CREATE INDEX tasks_task_title_trgm_gin ON tasks_task USING gin (title gin_trgm_ops);",
+]
+
+REVERSE_SQL = [
+    "DROP INDEX IF EXISTS tasks_task_title_trgm_gin;",
+    "DROP INDEX IF EXISTS tasks_task_search_vector_gin;",
+    "DROP TRIGGER IF EXISTS tasks_task_search_vector_trigger ON tasks_task;",
+    "DROP FUNCTION IF EXISTS tasks_task_search_vector_update();",
+]
+
+
+def _run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_add_task_link'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(_run_on_postgres(FORWARD_SQL), _run_on_postgres(REVERSE_SQL)),
+    ]
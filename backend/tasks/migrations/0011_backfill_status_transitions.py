@@ -0,0 +1,56 @@
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def backfill_transitions(apps, schema_editor):
+    """Rebuild the transition history of existing tasks from their create/status audit entries."""
+    AuditLog = apps.get_model("audit_logs", "AuditLog")
+    Task = apps.get_model("tasks", "Task")
+    TaskStatusTransition = apps.get_model("tasks", "TaskStatusTransition")
+    task_ids = set(Task.objects.values_list("id", flat=True))
+    logs = (
+        AuditLog.objects.filter(model_name="task", action__in=["create", "status"])
+        .order_by("created_at", "id")
+        .values_list("object_id", "action", "changes", "user_id", "created_at")
+    )
+    batch = []
+    for object_id, action, changes, user_id, created_at in logs.iterator(chunk_size=BATCH_SIZE):
+        if object_id not in task_ids:
+            continue
+        changes = changes or {}
+        if action == "create":
+            from_status, to_status = None, changes.get("status", "pending")
+        else:
+            from_status, to_status = changes.get("previous"), changes.get("status")
+        if not to_status:
+            continue
+        batch.append(
+            TaskStatusTransition(
+                task_id=object_id,
+                from_status=from_status,
+                to_status=to_status,
+                changed_by_id=user_id,
+                created_at=created_at,
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            TaskStatusTransition.objects.bulk_create(batch)
+            batch = []
+    TaskStatusTransition.objects.bulk_create(batch)
+
+
+def clear_transitions(apps, schema_editor):
+    apps.get_model("tasks", "TaskStatusTransition").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0010_task_status_transition"),
+        ("audit_logs", "0004_audit_created_at_default"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_transitions, clear_transitions),
+    ]
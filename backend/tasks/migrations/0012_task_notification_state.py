@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 05:26
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_past_events_notified(apps, schema_editor):
+    """Reminders/deadlines already in the past were handled by the old sweep; don't fire them again."""
+    Task = apps.get_model("tasks", "Task")
+    now = timezone.now()
+    Task.objects.filter(reminder_datetime__lte=now).update(reminder_sent_at=now)
+    Task.objects.filter(deadline__lte=now).update(deadline_notified_at=now)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0011_backfill_status_transitions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='deadline_notified_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('reminder_sent_at__isnull', True), ('status__in', ['pending', 'ongoing'])), fields=['reminder_datetime'], name='task_reminder_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('deadline_notified_at__isnull', True), ('status__in', ['pending', 'ongoing'])), fields=['deadline'], name='task_deadline_pending_idx'),
+        ),
+        migrations.RunPython(mark_past_events_notified, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,4 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
@@ -17,6 +18,21 @@ STATUS_CHOICES = [
     ("cancelled", "Cancelled"),
 ]
 
+# Statuses that still need attention (reminders, deadlines, overdue).
+ACTIVE_STATUSES = ["pending", "ongoing"]
+
+
+def overdue_q(now=None):
+    """Active task past its deadline (DB-side Task.is_overdue); served by task_active_deadline_idx."""
+    # deadline IS NOT NULL keeps the predicate two-valued: without it a task with no deadline
+    # annotates overdue=NULL, which sorts ahead of true in ?ordering=-overdue on Postgres.
+    return models.Q(status__in=ACTIVE_STATUSES, deadline__isnull=False, deadline__lt=now or timezone.now())
+
+
+def overdue_annotation(now=None):
+    """Boolean expression for .annotate(overdue=...), usable in filter() and order_by()."""
+    return models.ExpressionWrapper(overdue_q(now), output_field=models.BooleanField())
+
 
 class Task(models.Model):
     title = models.CharField(max_length=255)
@@ -51,17 +67,53 @@ class Task(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
     deadline = models.DateTimeField(null=True, blank=True)
     reminder_datetime = models.DateTimeField(null=True, blank=True)
+    # When the reminder / deadline notification fired (tasks.reminders); reset when the time changes.
+    reminder_sent_at = models.DateTimeField(null=True, blank=True, editable=False)
+    deadline_notified_at = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Weighted title (A) + description (B) tsvector, maintained by a Postgres trigger (migration 0007).
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "deadline"], name="task_status_deadline_idx"),
+            models.Index(fields=["status", "reminder_datetime"], name="task_status_reminder_idx"),
+            # Active-only partial indexes: reminder/deadline sweeps and overdue views never touch closed tasks.
+            models.Index(
+                fields=["deadline"],
+                name="task_active_deadline_idx",
+                condition=models.Q(status__in=ACTIVE_STATUSES),
+            ),
+            models.Index(
+                fields=["reminder_datetime"],
+                name="task_active_reminder_idx",
+                condition=models.Q(status__in=ACTIVE_STATUSES),
+            ),
+            # Reminder/deadline sweep: only rows that are due and not yet notified stay in these.
+            models.Index(
+                fields=["reminder_datetime"],
+                name="task_reminder_pending_idx",
+                condition=models.Q(status__in=ACTIVE_STATUSES, reminder_sent_at__isnull=True),
+            ),
+            models.Index(
+                fields=["deadline"],
+                name="task_deadline_pending_idx",
+                condition=models.Q(status__in=ACTIVE_STATUSES, deadline_notified_at__isnull=True),
+            ),
+            models.Index(fields=["created_at", "id"], name="task_created_id_idx"),
+            models.Index(fields=["updated_at", "id"], name="task_updated_id_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
     @property
     def is_overdue(self):
+        annotated = self.__dict__.get("overdue")
+        if annotated is not None:
+            return annotated
         if not self.deadline or self.status in ("finished", "cancelled"):
             return False
         return timezone.now() > self.deadline
@@ -82,6 +134,9 @@ class TaskComment(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["task", "created_at"], name="task_comment_task_created_idx"),
+        ]
 
     def __str__(self):
         return f"Comment on task {self.task_id} by {self.author_id}"
@@ -107,3 +162,63 @@ class TaskLink(models.Model):
 
     def __str__(self):
         return self.label or self.url[:50]
+
+
+class TaskStatusTransition(models.Model):
+    """
+    One row per status change (from_status is null for the initial status at creation).
+    Backs the status timeline and the cycle/lead time analytics (tasks.analytics).
+    """
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="status_transitions")
+    from_status = models.CharField(max_length=20, choices=STATUS_CHOICES, null=True, blank=True)
+    to_status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="task_status_transitions",
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["created_at", "id"]
+        indexes = [
+            models.Index(fields=["task", "created_at", "id"], name="task_transition_task_idx"),
+            models.Index(fields=["to_status", "created_at"], name="task_transition_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"task {self.task_id}: {self.from_status} -> {self.to_status}"
+
+
+class TaskTombstone(models.Model):
+    """
+    Removal marker for delta sync (/api/tasks/changes/): the task was deleted (user is null,
+    applies to everyone) or dropped out of one user's visibility (user set). task_id is a plain
+    integer because the task row may be gone.
+    """
+    REASON_DELETED = "deleted"
+    REASON_HIDDEN = "hidden"
+    REASON_CHOICES = [(REASON_DELETED, "Deleted"), (REASON_HIDDEN, "No longer visible")]
+
+    task_id = models.BigIntegerField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="task_tombstones",
+    )
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["created_at"], name="task_tombstone_created_idx"),
+            models.Index(fields=["user", "created_at"], name="task_tombstone_user_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.reason} task {self.task_id}"
@@ -0,0 +1,24 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+from config.pagination import KeysetPagination
+
+
+class TaskKeysetPagination(KeysetPagination):
+    """
+    Cursor mode for the task list (infinite-scroll board); one key per supported ordering.
+    overdue and search relevance (?search= without ?ordering=) have no stable key, so they
+    are only available with page-number pagination and answer 400 here.
+    """
+    ordering_fields = ("created_at", "updated_at", "deadline", "priority")
+    default_ordering = "-created_at"
+
+    def get_ordering(self, request):
+        if request.query_params.get(api_settings.SEARCH_PARAM) and not request.query_params.get(self.ordering_param):
+            raise ValidationError({
+                self.ordering_param: [
+                    "Search results are ordered by relevance, which cursor pagination cannot page through; "
+                    f"pass ?ordering= (one of {', '.join(self.ordering_fields)}) or use page-number pagination."
+                ]
+            })
+        return super().get_ordering(request)
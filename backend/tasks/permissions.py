@@ -1,5 +1,5 @@
 from rest_framework import permissions
-from django.db.models import Q
+from .visibility import is_task_visible
 
 
 def user_has_perm(user, perm_name):
@@ -7,6 +7,10 @@ def user_has_perm(user, perm_name):
         return False
     if user.is_superuser:
         return True
+    # Current permission claims from the access token (users.authentication) avoid loading user.role.
+    token_permissions = getattr(user, "token_permissions", None)
+    if token_permissions is not None:
+        return perm_name in token_permissions
     role = getattr(user, "role", None)
     if not role:
         return False
@@ -24,13 +28,7 @@ def user_can_view_task(user, task):
         return False
     if user_can_see_all_tasks(user):
         return True
-    if task.created_by_id == user.id:
-        return True
-    if task.assigned_to_id == user.id:
-        return True
-    if task.assignees.filter(id=user.id).exists():
-        return True
-    return False
+    return is_task_visible(user, task)
 
 
 class TaskPermissions(permissions.BasePermission):
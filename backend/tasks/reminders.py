@@ -2,87 +2,156 @@
 Shared logic for creating reminder and deadline notifications.
 Used by the management command and by the Celery periodic task.
 
-Flow: Celery Beat runs check_reminders_and_deadlines every minute. This creates
-Notification rows for tasks whose reminder_datetime or deadline has passed. The
-notifications app's post_save signal pushes each new notification over the
-channel layer (Redis) to the user's WebSocket group. The frontend (Layout)
-receives it on /ws/notifications/, adds it to the store, and plays a sound.
-Requires CHANNEL_LAYERS to use Redis (not InMemoryChannelLayer) so the Celery
-worker and Daphne share the same layer.
+Flow: Celery Beat runs check_reminders_and_deadlines every minute. Each run claims the
+active tasks whose reminder_datetime / deadline has passed and that have not fired yet
+(reminder_sent_at / deadline_notified_at is null): on Postgres one UPDATE ... RETURNING
+per kind both marks and returns them, so each run only touches newly due tasks (served by
+the task_reminder_pending_idx / task_deadline_pending_idx partial indexes) and concurrent
+runs cannot claim the same task twice. The notifications are written in one batch by a
+NotificationDispatcher, which then pushes them over the channel layer (Redis) to each
+user's WebSocket group. The frontend (Layout) receives it on /ws/notifications/, adds it
+to the store, and plays a sound. Requires CHANNEL_LAYERS to use Redis (not
+InMemoryChannelLayer) so the Celery worker and Daphne share the same layer.
+
+Changing a task's reminder_datetime or deadline clears the marker (TaskSerializer.update),
+so the new time fires again.
+
+Overlap: a full sweep holds a transaction-level Postgres advisory lock, so a sweep that starts
+while the previous one is still running (e.g. draining an outage backlog) returns at once
+instead of racing it. Claims select rows FOR UPDATE SKIP LOCKED, so anything else claiming at
+the same time (the precise scheduler, chunk workers) takes disjoint tasks instead of waiting.
+With REMINDER_SWEEP_CHUNK_SIZE set, the Beat task only counts what is due and fans out that
+many process_reminder_chunk Celery tasks; each claims up to chunk-size of the oldest due tasks
+per kind in its own transaction, so several workers drain a backlog in parallel.
 """
+import logging
+import math
+from typing import NamedTuple
+
+from django.db import connection, transaction
 from django.utils import timezone
-from django.db.models import Q
 
-from tasks.models import Task
+from tasks.models import Task, ACTIVE_STATUSES
+from notifications.dispatch import NotificationDispatcher
 from notifications.models import Notification
 
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_xact_lock key for the full sweep ("rmnd").
+SWEEP_LOCK_ID = 0x726D6E64
+
+# (time field, marker field, notification type, title, message template)
+_EVENTS = {
+    "reminder": (
+        "reminder_datetime", "reminder_sent_at", Notification.TYPE_REMINDER,
+        "Reminder", 'Task "{title}" reminder.',
+    ),
+    "deadline": (
+        "deadline", "deadline_notified_at", Notification.TYPE_DEADLINE,
+        "Deadline Reached", 'Task "{title}" has reached its deadline.',
+    ),
+}
+
+
+def _due(time_field, marker_field, now):
+    return Task.objects.filter(
+        status__in=ACTIVE_STATUSES,
+        **{f"{marker_field}__isnull": True, f"{time_field}__isnull": False, f"{time_field}__lte": now},
+    )
+
+
+def claim_due_tasks(time_field, marker_field, now, limit=None):
+    """
+    Mark due, not-yet-notified active tasks (at most `limit`, oldest first) as notified at `now`;
+    return their (id, title, recipient_id). Rows locked by a concurrent claim are skipped.
+    """
+    if connection.vendor == "postgresql":
+        table = Task._meta.db_table
+        placeholders = ", ".join(["%s"] * len(ACTIVE_STATUSES))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {table} SET {marker_field} = %s
+                WHERE id IN (
+                    SELECT id FROM {table}
+                    WHERE status IN ({placeholders}) AND {marker_field} IS NULL
+                      AND {time_field} IS NOT NULL AND {time_field} <= %s
+                    ORDER BY {time_field}
+                    {"LIMIT %s" if limit else ""}
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id, title, COALESCE(assigned_to_id, created_by_id)
+                """,
+                [now, *ACTIVE_STATUSES, now, *([limit] if limit else [])],
+            )
+            return cursor.fetchall()
+    with transaction.atomic():
+        due = _due(time_field, marker_field, now).select_for_update(skip_locked=True).order_by(time_field)
+        if limit:
+            due = due[:limit]
+        rows = list(due.values_list("id", "title", "assigned_to_id", "created_by_id"))
+        Task.objects.filter(id__in=[row[0] for row in rows]).update(**{marker_field: now})
+    return [(pk, title, assigned_to_id or created_by_id) for pk, title, assigned_to_id, created_by_id in rows]
+
+
+def _try_sweep_lock():
+    """Take the sweep lock for the current transaction; False if another sweep holds it."""
+    if connection.vendor != "postgresql":
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [SWEEP_LOCK_ID])
+        return cursor.fetchone()[0]
+
+
+class SweepResult(NamedTuple):
+    """Notifications created per kind, and tasks claimed per kind (claimed tasks with no recipient get none)."""
+    reminders: int
+    deadlines: int
+    reminders_claimed: int = 0
+    deadlines_claimed: int = 0
+
+
+def count_due(now=None) -> tuple[int, int]:
+    now = now or timezone.now()
+    return tuple(_due(time_field, marker_field, now).count() for time_field, marker_field, *_ in _EVENTS.values())
+
+
+def plan_chunks(chunk_size) -> int:
+    """Number of chunk_size claims needed to drain what is due now."""
+    return math.ceil(max(count_due()) / chunk_size)
+
 
-def process_reminders_and_deadlines(*, dry_run: bool = False) -> tuple[int, int]:
+def process_reminders_and_deadlines(*, dry_run: bool = False, limit: int = None) -> SweepResult:
     """
     Create notifications for tasks whose reminder_datetime or deadline has been reached.
-    Returns (reminders_created, deadlines_created).
+    Returns a SweepResult; with dry_run, the counts that are due (nothing is claimed).
+    With limit, claim at most that many tasks per kind (one chunk) and skip the sweep lock;
+    a chunk is full, and more may be due, when a kind's claimed count reaches limit.
     """
     now = timezone.now()
-    active = Q(status="pending") | Q(status="ongoing")
-    reminders_created = 0
-    deadlines_created = 0
-
-    # Reminders: reminder_datetime <= now
-    reminder_tasks = Task.objects.filter(
-        active,
-        reminder_datetime__isnull=False,
-        reminder_datetime__lte=now,
-    ).select_related("assigned_to", "created_by")
-
-    for task in reminder_tasks:
-        if Notification.objects.filter(
-            notification_type=Notification.TYPE_REMINDER,
-            extra_data__task_id=task.id,
-            created_at__gte=now - timezone.timedelta(hours=1),
-        ).exists():
-            continue
-        recipient = task.assigned_to or task.created_by
-        if not recipient:
-            continue
-        if dry_run:
-            continue
-        Notification.objects.create(
-            recipient=recipient,
-            notification_type=Notification.TYPE_REMINDER,
-            title="Reminder",
-            message=f'Task "{task.title}" reminder.',
-            link=f"/tasks/{task.id}",
-            extra_data={"task_id": task.id},
-        )
-        reminders_created += 1
-
-    # Deadlines: deadline <= now
-    deadline_tasks = Task.objects.filter(
-        active,
-        deadline__isnull=False,
-        deadline__lte=now,
-    ).select_related("assigned_to", "created_by")
-
-    for task in deadline_tasks:
-        if Notification.objects.filter(
-            notification_type=Notification.TYPE_DEADLINE,
-            extra_data__task_id=task.id,
-            created_at__gte=now - timezone.timedelta(hours=24),
-        ).exists():
-            continue
-        recipient = task.assigned_to or task.created_by
-        if not recipient:
-            continue
-        if dry_run:
-            continue
-        Notification.objects.create(
-            recipient=recipient,
-            notification_type=Notification.TYPE_DEADLINE,
-            title="Deadline Reached",
-            message=f'Task "{task.title}" has reached its deadline.',
-            link=f"/tasks/{task.id}",
-            extra_data={"task_id": task.id},
-        )
-        deadlines_created += 1
-
-    return reminders_created, deadlines_created
+    if dry_run:
+        return SweepResult(*count_due(now))
+    created, claimed = {}, {}
+    # Claims and notifications commit together: a failed insert leaves the tasks due for the next run.
+    with transaction.atomic():
+        if not limit and not _try_sweep_lock():
+            logger.info("reminder sweep already running; skipped")
+            return SweepResult(0, 0)
+        dispatcher = NotificationDispatcher()
+        for kind, (time_field, marker_field, notification_type, title, template) in _EVENTS.items():
+            rows = claim_due_tasks(time_field, marker_field, now, limit)
+            claimed[kind], created[kind] = len(rows), 0
+            for task_id, task_title, recipient_id in rows:
+                if not recipient_id:
+                    continue
+                dispatcher.add(
+                    recipient_id,
+                    notification_type,
+                    title,
+                    template.format(title=task_title),
+                    f"/tasks/{task_id}",
+                    {"task_id": task_id},
+                )
+                created[kind] += 1
+        dispatcher.flush()
+    return SweepResult(created["reminder"], created["deadline"], claimed["reminder"], claimed["deadline"])
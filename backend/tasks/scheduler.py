@@ -0,0 +1,162 @@
+"""
+Precise reminder/deadline scheduler (`manage.py run_reminder_scheduler`).
+
+A Redis sorted set holds one member per task that still has a reminder or deadline to fire,
+scored by the earliest pending time (epoch seconds). The scheduler process blocks on a wake
+list until the lowest score comes due, then runs process_reminders_and_deadlines() (the
+claim is idempotent, so early or duplicate wake-ups are harmless) and re-scores the tasks it
+woke for: a task whose reminder fired goes back in with its deadline, a finished one drops out.
+
+Writers keep the set current after commit: tasks.signals for single saves (create, reschedule,
+status change) and the bulk endpoint for bulk_create/bulk_update. schedule_tasks() re-reads
+the affected rows, updates their scores and pushes a token onto the wake list so a sleeping
+scheduler picks up an earlier time. Deleted tasks are not removed eagerly; they fall out the
+next time they come due. The set is rebuilt from the database when the scheduler starts.
+
+Celery Beat's check_reminders_and_deadlines keeps running as a reconciliation sweep (every
+REMINDER_SWEEP_MINUTES) for anything missed while Redis or the scheduler was down. Everything
+here is off unless REMINDER_SCHEDULER_ENABLED is set; Redis errors on the write path are
+logged and left to the sweep.
+"""
+import logging
+import time
+
+import redis
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import Q
+
+from .models import Task, ACTIVE_STATUSES
+from .reminders import process_reminders_and_deadlines
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_KEY = "tasks:reminders:schedule"
+WAKE_KEY = "tasks:reminders:wake"
+REBUILD_CHUNK = 1000
+
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REMINDER_SCHEDULER_REDIS_URL)
+    return _client
+
+
+def enabled():
+    return settings.REMINDER_SCHEDULER_ENABLED
+
+
+def _pending_q():
+    return Q(status__in=ACTIVE_STATUSES) & (
+        Q(reminder_sent_at__isnull=True, reminder_datetime__isnull=False)
+        | Q(deadline_notified_at__isnull=True, deadline__isnull=False)
+    )
+
+
+def _next_due(status, reminder_datetime, reminder_sent_at, deadline, deadline_notified_at):
+    """Epoch seconds of the task's next reminder/deadline, or None if nothing is left to fire."""
+    if status not in ACTIVE_STATUSES:
+        return None
+    times = []
+    if reminder_datetime and reminder_sent_at is None:
+        times.append(reminder_datetime)
+    if deadline and deadline_notified_at is None:
+        times.append(deadline)
+    return min(times).timestamp() if times else None
+
+
+_FIELDS = ("id", "status", "reminder_datetime", "reminder_sent_at", "deadline", "deadline_notified_at")
+
+
+def schedule_tasks(task_ids):
+    """Re-score the given tasks from the database (one query, one Redis round trip)."""
+    task_ids = set(task_ids)
+    if not enabled() or not task_ids:
+        return
+    scores = {}
+    for pk, *fields in Task.objects.filter(id__in=task_ids).values_list(*_FIELDS):
+        due = _next_due(*fields)
+        if due is not None:
+            scores[pk] = due
+    try:
+        pipe = get_client().pipeline(transaction=False)
+        if scores:
+            pipe.zadd(SCHEDULE_KEY, scores)
+            pipe.lpush(WAKE_KEY, 1)
+            pipe.ltrim(WAKE_KEY, 0, 0)
+        removed = task_ids - set(scores)
+        if removed:
+            pipe.zrem(SCHEDULE_KEY, *removed)
+        pipe.execute()
+    except redis.RedisError:
+        logger.warning("reminder schedule unavailable; %d task(s) left to the sweep", len(task_ids), exc_info=True)
+
+
+def schedule_on_commit(task_ids):
+    task_ids = list(task_ids)
+    if enabled() and task_ids:
+        transaction.on_commit(lambda: schedule_tasks(task_ids))
+
+
+def rebuild():
+    """Replace the schedule with every pending task from the database; returns its size."""
+    client = get_client()
+    staging = f"{SCHEDULE_KEY}:rebuild"
+    client.delete(staging)
+    rows = Task.objects.filter(_pending_q()).values_list(*_FIELDS).order_by()
+    size, chunk = 0, {}
+    for pk, *fields in rows.iterator(chunk_size=REBUILD_CHUNK):
+        due = _next_due(*fields)
+        if due is None:
+            continue
+        chunk[pk] = due
+        if len(chunk) >= REBUILD_CHUNK:
+            client.zadd(staging, chunk)
+            size, chunk = size + len(chunk), {}
+    if chunk:
+        client.zadd(staging, chunk)
+        size += len(chunk)
+    if size:
+        client.rename(staging, SCHEDULE_KEY)
+    else:
+        client.delete(SCHEDULE_KEY)
+    return size
+
+
+def run_due(now=None):
+    """Fire everything due and re-score the woken tasks; returns the SweepResult."""
+    client = get_client()
+    now = time.time() if now is None else now
+    woken = [int(member) for member in client.zrangebyscore(SCHEDULE_KEY, "-inf", now)]
+    result = process_reminders_and_deadlines()
+    if woken:
+        client.zrem(SCHEDULE_KEY, *woken)
+        schedule_tasks(woken)
+    return result
+
+
+def run(max_sleep=60.0, stop=lambda: False):
+    """Scheduler loop: sleep until the earliest pending time (or a wake-up), fire, repeat."""
+    client = get_client()
+    logger.info("reminder scheduler started with %d pending task(s)", rebuild())
+    while not stop():
+        try:
+            close_old_connections()
+            head = client.zrange(SCHEDULE_KEY, 0, 0, withscores=True)
+            now = time.time()
+            if head and head[0][1] <= now:
+                result = run_due(now)
+                logger.info("fired %d reminder(s) and %d deadline(s)", result.reminders, result.deadlines)
+                if not result.reminders_claimed and not result.deadlines_claimed:
+                    # Due rows were skipped because a sweep holds them; give it a moment to commit.
+                    client.blpop([WAKE_KEY], timeout=1)
+                continue
+            timeout = min(head[0][1] - now, max_sleep) if head else max_sleep
+            client.blpop([WAKE_KEY], timeout=max(timeout, 0.01))  # 0 would block forever
+        except (redis.RedisError, DatabaseError):
+            logger.exception("reminder scheduler iteration failed; retrying")
+            close_old_connections()
+            time.sleep(5)
@@ -0,0 +1,32 @@
+"""
+Task search backend. On Postgres, ?search= matches the trigger-maintained search_vector
+(GIN, websearch syntax, weighted title > description) OR a pg_trgm fuzzy match on title
+(GIN gin_trgm_ops), and results are ordered by relevance unless ?ordering= is given.
+On other databases it falls back to DRF's SearchFilter (ILIKE on search_fields).
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connections
+from django.db.models import F, Q
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+
+class TaskSearchFilter(filters.SearchFilter):
+    search_config = "english"
+
+    def filter_queryset(self, request, queryset, view):
+        if connections[queryset.db].vendor != "postgresql":
+            return super().filter_queryset(request, queryset, view)
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        text = " ".join(terms)
+        query = SearchQuery(text, config=self.search_config, search_type="websearch")
+        queryset = queryset.filter(
+            Q(search_vector=query) | Q(title__trigram_similar=text)
+        ).annotate(
+            search_rank=SearchRank(F("search_vector"), query) + TrigramSimilarity("title", text),
+        )
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by("-search_rank", "-created_at")
+        return queryset
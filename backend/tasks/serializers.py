@@ -1,9 +1,21 @@
 from rest_framework import serializers
 from users.serializers import UserMinimalSerializer, RoleSerializer
-from .models import Task, TaskComment, TaskLink
+from users.models import User
+from .models import Task, TaskComment, TaskLink, PRIORITY_CHOICES, STATUS_CHOICES
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """Accept a `fields` kwarg (iterable of names) and drop every other declared field."""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class TaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     created_by_detail = UserMinimalSerializer(source="created_by", read_only=True)
     assigned_to_detail = UserMinimalSerializer(source="assigned_to", read_only=True)
     assigned_to_role_detail = RoleSerializer(source="assigned_to_role", read_only=True)
@@ -45,6 +57,38 @@ class TaskSerializer(serializers.ModelSerializer):
         validated_data.pop("assigned_to", None)
         return super().create(validated_data)
 
+    def update(self, instance, validated_data):
+        # A moved reminder/deadline is a new event: let the sweep (tasks.reminders) fire it again.
+        if "reminder_datetime" in validated_data and validated_data["reminder_datetime"] != instance.reminder_datetime:
+            instance.reminder_sent_at = None
+        if "deadline" in validated_data and validated_data["deadline"] != instance.deadline:
+            instance.deadline_notified_at = None
+        return super().update(instance, validated_data)
+
+
+class TaskListSerializer(TaskSerializer):
+    """Compact list row (?compact=true): no description, no creator/role detail objects."""
+
+    class Meta(TaskSerializer.Meta):
+        fields = [
+            "id",
+            "title",
+            "created_by",
+            "assigned_to",
+            "assigned_to_detail",
+            "assigned_to_role",
+            "assignees",
+            "assignees_detail",
+            "priority",
+            "status",
+            "deadline",
+            "reminder_datetime",
+            "created_at",
+            "updated_at",
+            "is_overdue",
+            "attachment_count",
+        ]
+
 
 class TaskLinkSerializer(serializers.ModelSerializer):
     class Meta:
@@ -60,3 +104,46 @@ class TaskCommentSerializer(serializers.ModelSerializer):
         model = TaskComment
         fields = ["id", "task", "author", "author_detail", "body", "created_at"]
         read_only_fields = ["task", "author", "created_at"]
+
+
+class TaskBulkItemSerializer(TaskSerializer):
+    """TaskSerializer for bulk create: assignees are plain ids, checked for all items in one query."""
+    assignees = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+
+class TaskBulkSerializer(serializers.Serializer):
+    """Payload of POST /api/tasks/bulk/: one action applied to many tasks."""
+    ACTION_CREATE = "create"
+    ACTION_STATUS = "status"
+    ACTION_REASSIGN = "reassign"
+    ACTION_PRIORITY = "priority"
+    ACTION_DELETE = "delete"
+    MAX_ITEMS = 500
+
+    action = serializers.ChoiceField(
+        choices=[ACTION_CREATE, ACTION_STATUS, ACTION_REASSIGN, ACTION_PRIORITY, ACTION_DELETE]
+    )
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=MAX_ITEMS)
+    tasks = TaskBulkItemSerializer(many=True, required=False, max_length=MAX_ITEMS)
+    status = serializers.ChoiceField(choices=STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=PRIORITY_CHOICES, required=False)
+    assignees = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), many=True, required=False)
+
+    def validate(self, attrs):
+        action = attrs["action"]
+        required = {
+            self.ACTION_CREATE: "tasks",
+            self.ACTION_STATUS: "status",
+            self.ACTION_REASSIGN: "assignees",
+            self.ACTION_PRIORITY: "priority",
+        }.get(action)
+        if required and required not in attrs:
+            raise serializers.ValidationError({required: f"Required for action '{action}'."})
+        if action != self.ACTION_CREATE and not attrs.get("ids"):
+            raise serializers.ValidationError({"ids": f"Required for action '{action}'."})
+        if action == self.ACTION_CREATE:
+            wanted = {uid for item in attrs["tasks"] for uid in item.get("assignees") or []}
+            unknown = wanted - set(User.objects.filter(id__in=wanted).values_list("id", flat=True))
+            if unknown:
+                raise serializers.ValidationError({"tasks": f"Unknown assignee ids: {sorted(unknown)}"})
+        return attrs
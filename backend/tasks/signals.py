@@ -1,16 +1,32 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from .models import Task
+from .models import Task, TaskStatusTransition
+from . import scheduler
+from audit_logs import sink as audit
 from audit_logs.models import AuditLog
 
 
 @receiver(post_save, sender=Task)
 def task_audit_on_create(sender, instance, created, **kwargs):
     if created:
-        AuditLog.objects.create(
-            user_id=instance.created_by_id,
-            action=AuditLog.ACTION_CREATE,
-            model_name="task",
-            object_id=instance.id,
-            changes={"title": instance.title, "status": instance.status},
+        audit.record(
+            instance.created_by_id,
+            AuditLog.ACTION_CREATE,
+            "task",
+            instance.id,
+            {"title": instance.title, "status": instance.status},
         )
+        TaskStatusTransition.objects.create(
+            task=instance, from_status=None, to_status=instance.status, changed_by_id=instance.created_by_id
+        )
+
+
+# Fields that decide whether and when a task still has a reminder or deadline to fire.
+SCHEDULE_FIELDS = {"status", "reminder_datetime", "reminder_sent_at", "deadline", "deadline_notified_at"}
+
+
+@receiver(post_save, sender=Task)
+def task_reschedule_reminders(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not SCHEDULE_FIELDS.intersection(update_fields):
+        return
+    scheduler.schedule_on_commit([instance.id])
@@ -0,0 +1,80 @@
+"""
+Dashboard statistics for the caller's visible tasks, computed in one grouped query: rows
+are grouped by (status, priority, assigned_to) with conditional COUNTs for overdue,
+due-today and due-this-week, then folded in Python into the per-dimension totals.
+
+open_by_assignee counts each open task once per user assigned through assigned_to or the
+assignees M2M (the same users the visibility rules treat as assignees). The assigned_to
+side comes from the grouped rows. One more grouped query on the through table adds the
+co-assignments whose user is not also the task's assigned_to.
+"""
+from datetime import timedelta
+
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from users.models import User
+from .models import ACTIVE_STATUSES, PRIORITY_CHOICES, STATUS_CHOICES, Task, overdue_q
+
+
+def compute_task_stats(queryset, now=None):
+    now = now or timezone.now()
+    today = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow = today + timedelta(days=1)
+    week_start = today - timedelta(days=today.weekday())
+    next_week = week_start + timedelta(days=7)
+    active = Q(status__in=ACTIVE_STATUSES)
+
+    rows = (
+        queryset.order_by()
+        .values("status", "priority", "assigned_to", "assigned_to__username")
+        .annotate(
+            total=Count("id"),
+            overdue=Count("id", filter=overdue_q(now)),
+            due_today=Count("id", filter=active & Q(deadline__gte=today, deadline__lt=tomorrow)),
+            due_this_week=Count("id", filter=active & Q(deadline__gte=week_start, deadline__lt=next_week)),
+        )
+    )
+
+    statuses = [s for s, _ in STATUS_CHOICES]
+    priorities = [p for p, _ in PRIORITY_CHOICES]
+    by_status_priority = {s: {p: 0 for p in priorities} for s in statuses}
+    totals = {"total": 0, "overdue": 0, "due_today": 0, "due_this_week": 0}
+    open_by_assignee = {}
+    for row in rows:
+        by_status_priority.setdefault(row["status"], {}).setdefault(row["priority"], 0)
+        by_status_priority[row["status"]][row["priority"]] += row["total"]
+        for key in totals:
+            totals[key] += row[key]
+        if row["status"] in ACTIVE_STATUSES and row["assigned_to"]:
+            entry = open_by_assignee.setdefault(
+                row["assigned_to"],
+                {"user_id": row["assigned_to"], "username": row["assigned_to__username"], "open": 0},
+            )
+            entry["open"] += row["total"]
+
+    open_ids = queryset.filter(status__in=ACTIVE_STATUSES).order_by().values("id")
+    co_assigned = (
+        Task.assignees.through.objects.filter(task_id__in=open_ids)
+        .exclude(task__assigned_to=F("user"))
+        .values("user")
+        .annotate(open=Count("task", distinct=True))
+    )
+    co_assigned = {row["user"]: row["open"] for row in co_assigned}
+    usernames = dict(
+        User.objects.filter(id__in=set(co_assigned) - set(open_by_assignee)).values_list("id", "username")
+    )
+    for user_id, count in co_assigned.items():
+        entry = open_by_assignee.setdefault(
+            user_id, {"user_id": user_id, "username": usernames.get(user_id), "open": 0}
+        )
+        entry["open"] += count
+
+    return {
+        **totals,
+        "by_status": {s: sum(counts.values()) for s, counts in by_status_priority.items()},
+        "by_priority": {p: sum(by_status_priority[s].get(p, 0) for s in by_status_priority) for p in priorities},
+        "by_status_priority": by_status_priority,
+        "open_by_assignee": sorted(open_by_assignee.values(), key=lambda e: (-e["open"], e["username"] or "")),
+        "generated_at": now.isoformat(),
+    }
@@ -0,0 +1,108 @@
+"""
+Delta sync for the task list: GET /api/tasks/changes/?since=<cursor>.
+
+Returns tasks the user can see that were created/updated after the cursor (ordered by
+(updated_at, id)), ids removed since then (TaskTombstone: deleted, or no longer visible to
+this user), and a new cursor. Clients apply `removed`, then upsert `changed`.
+
+The cursor is (updated_at, id) of the last row returned. When a response is complete the
+cursor is held back by SAFETY_WINDOW so rows whose transaction committed late (updated_at
+stamped before an earlier poll saw it) are picked up by the next poll; clients upsert by id,
+so seeing a row twice is harmless.
+"""
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import TaskTombstone
+
+SAFETY_WINDOW = timedelta(seconds=5)
+MAX_CHANGES = 500
+
+
+class CursorExpired(Exception):
+    """The cursor predates tombstone retention; the client must do a full refetch."""
+
+
+def encode_cursor(ts, pk=0):
+    raw = json.dumps({"t": ts.isoformat(), "id": pk}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def start_cursor(now=None):
+    """Cursor for a client about to do its initial full fetch, held back like every later cursor."""
+    return encode_cursor((now or timezone.now()) - SAFETY_WINDOW)
+
+
+def decode_cursor(cursor):
+    """Return (datetime, id); raises ValueError on malformed input."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        ts = parse_datetime(data["t"])
+        pk = int(data["id"])
+    except (TypeError, KeyError, ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    if ts is None:
+        raise ValueError("Invalid cursor")
+    return ts, pk
+
+
+def record_deleted(task_ids):
+    TaskTombstone.objects.bulk_create(
+        [TaskTombstone(task_id=tid, reason=TaskTombstone.REASON_DELETED) for tid in task_ids]
+    )
+
+
+def record_hidden(task_id, user_ids):
+    """task_id dropped out of these users' visibility (e.g. unassigned)."""
+    TaskTombstone.objects.bulk_create(
+        [TaskTombstone(task_id=task_id, user_id=uid, reason=TaskTombstone.REASON_HIDDEN) for uid in user_ids if uid]
+    )
+
+
+def collect_changes(visible_qs, user, since, sees_all):
+    """
+    visible_qs: the user's visible tasks (already restricted and select/prefetched).
+    Returns (changed_tasks, removed_ids, next_cursor, has_more).
+    """
+    now = timezone.now()
+    since_ts, since_id = since
+    if since_ts < now - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS):
+        raise CursorExpired()
+
+    after = Q(updated_at__gt=since_ts) | Q(updated_at=since_ts, id__gt=since_id)
+    changed = list(visible_qs.filter(after).order_by("updated_at", "id")[: MAX_CHANGES + 1])
+    has_more = len(changed) > MAX_CHANGES
+    changed = changed[:MAX_CHANGES]
+
+    tombstones = TaskTombstone.objects.filter(created_at__gte=since_ts)
+    if sees_all:
+        tombstones = tombstones.filter(user__isnull=True)
+    else:
+        tombstones = tombstones.filter(Q(user__isnull=True) | Q(user=user))
+    if has_more:
+        tombstones = tombstones.filter(created_at__lte=changed[-1].updated_at)
+    changed_ids = {t.id for t in changed}
+    removed = sorted(set(tombstones.values_list("task_id", flat=True)) - changed_ids)
+
+    if has_more:
+        cursor = encode_cursor(changed[-1].updated_at, changed[-1].id)
+    else:
+        held_back = now - SAFETY_WINDOW
+        if changed and (changed[-1].updated_at, changed[-1].id) < (held_back, 0):
+            cursor = encode_cursor(changed[-1].updated_at, changed[-1].id)
+        else:
+            cursor = encode_cursor(max(held_back, since_ts), 0 if held_back > since_ts else since_id)
+    return changed, removed, cursor, has_more
+
+
+def prune_tombstones():
+    cutoff = timezone.now() - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+    deleted, _ = TaskTombstone.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
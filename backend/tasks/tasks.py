@@ -2,14 +2,39 @@
 Celery tasks for TaskFlow.
 """
 from celery import shared_task
-from .reminders import process_reminders_and_deadlines
+from django.conf import settings
+from notifications import outbox
+from .reminders import plan_chunks, process_reminders_and_deadlines
+from .sync import prune_tombstones
 
 
 @shared_task(name="tasks.check_reminders_and_deadlines")
 def check_reminders_and_deadlines() -> dict:
     """
     Periodic task: create notifications for tasks whose reminder_datetime
-    or deadline has been reached. Run every minute via Celery Beat.
+    or deadline has been reached. Run every minute via Celery Beat. With
+    REMINDER_SWEEP_CHUNK_SIZE set, fan the due tasks out to process_reminder_chunk instead.
     """
-    reminders_created, deadlines_created = process_reminders_and_deadlines(dry_run=False)
-    return {"reminders": reminders_created, "deadlines": deadlines_created}
+    chunk_size = settings.REMINDER_SWEEP_CHUNK_SIZE
+    if chunk_size:
+        chunks = plan_chunks(chunk_size)
+        for _ in range(chunks):
+            process_reminder_chunk.delay(chunk_size)
+        return {"chunks": chunks}
+    result = process_reminders_and_deadlines(dry_run=False)
+    outbox.dispatcher.join()
+    return {"reminders": result.reminders, "deadlines": result.deadlines}
+
+
+@shared_task(name="tasks.process_reminder_chunk")
+def process_reminder_chunk(chunk_size) -> dict:
+    """Claim and notify up to chunk_size of the oldest due reminders and deadlines."""
+    result = process_reminders_and_deadlines(limit=chunk_size)
+    outbox.dispatcher.join()
+    return {"reminders": result.reminders, "deadlines": result.deadlines}
+
+
+@shared_task(name="tasks.prune_task_tombstones")
+def prune_task_tombstones() -> dict:
+    """Daily: drop delta-sync tombstones older than TASK_TOMBSTONE_RETENTION_DAYS."""
+    return {"deleted": prune_tombstones()}
@@ -0,0 +1,126 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APITestCase
+
+from audit_logs.models import AuditLog
+from notifications.models import Notification
+from users.models import Role, User
+from .models import Task, TaskComment, TaskTombstone
+
+
+class TaskDetailLastModifiedTests(APITestCase):
+    def setUp(self):
+        role = Role.objects.create(name="Viewer", can_view_tasks=True)
+        self.user = User.objects.create(username="viewer", email="viewer@example.com", role=role)
+        self.client.force_authenticate(self.user)
+        self.task = Task.objects.create(title="Task", created_by=self.user)
+
+    def test_if_modified_since_on_plain_detail(self):
+        response = self.client.get(f"/api/tasks/{self.task.id}/")
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(f"/api/tasks/{self.task.id}/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_bundle_is_not_validated_by_if_modified_since(self):
+        path = f"/api/tasks/{self.task.id}/?include=comments"
+        since = http_date((timezone.now() + timedelta(minutes=1)).timestamp())
+        response = self.client.get(path)
+        self.assertNotIn("Last-Modified", response)
+        TaskComment.objects.create(task=self.task, author=self.user, body="new")
+        response = self.client.get(path, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["comments"]), 1)
+
+    def test_passed_deadline_moves_last_modified(self):
+        now = timezone.now()
+        Task.objects.filter(pk=self.task.pk).update(
+            updated_at=now - timedelta(hours=2), deadline=now - timedelta(hours=1)
+        )
+        since = http_date((now - timedelta(hours=2)).timestamp())
+        response = self.client.get(f"/api/tasks/{self.task.id}/", HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["is_overdue"])
+
+
+class TaskChangesStartCursorTests(APITestCase):
+    def test_row_committed_late_is_delivered_after_bootstrap(self):
+        role = Role.objects.create(name="Viewer", can_view_tasks=True)
+        user = User.objects.create(username="viewer", email="viewer@example.com", role=role)
+        self.client.force_authenticate(user)
+        cursor = self.client.get("/api/tasks/changes/").data["cursor"]
+        # Stamped just before the bootstrap but committed after it.
+        task = Task.objects.create(title="Late", created_by=user)
+        Task.objects.filter(pk=task.pk).update(updated_at=timezone.now() - timedelta(seconds=1))
+        response = self.client.get("/api/tasks/changes/", {"since": cursor})
+        self.assertEqual([row["id"] for row in response.data["changed"]], [task.id])
+
+
+class TaskDeleteAtomicityTests(APITestCase):
+    def test_failed_delete_leaves_no_tombstone_or_audit_entry(self):
+        role = Role.objects.create(name="Editor", can_view_tasks=True, can_delete_tasks=True)
+        user = User.objects.create(username="editor", email="editor@example.com", role=role)
+        self.client.force_authenticate(user)
+        task = Task.objects.create(title="Keep", created_by=user)
+        with mock.patch.object(Task, "delete", side_effect=RuntimeError("delete failed")):
+            with self.assertRaises(RuntimeError):
+                self.client.delete(f"/api/tasks/{task.id}/")
+        self.assertTrue(Task.objects.filter(pk=task.pk).exists())
+        self.assertFalse(TaskTombstone.objects.filter(task_id=task.id).exists())
+        self.assertFalse(AuditLog.objects.filter(action=AuditLog.ACTION_DELETE, object_id=task.id).exists())
+
+
+class TaskStatsOpenByAssigneeTests(APITestCase):
+    def test_co_assignees_count_once_per_open_task(self):
+        role = Role.objects.create(name="Viewer", can_view_tasks=True)
+        viewer = User.objects.create(username="viewer", email="viewer@example.com", role=role)
+        ann = User.objects.create(username="ann", email="ann@example.com")
+        bob = User.objects.create(username="bob", email="bob@example.com")
+        shared = Task.objects.create(title="Shared", created_by=viewer, assigned_to=ann)
+        shared.assignees.set([ann, bob])
+        Task.objects.create(title="Bob's", created_by=viewer).assignees.set([bob])
+        Task.objects.create(title="Done", created_by=viewer, status="finished").assignees.set([bob])
+        self.client.force_authenticate(viewer)
+        response = self.client.get("/api/tasks/stats/")
+        open_counts = {entry["username"]: entry["open"] for entry in response.data["open_by_assignee"]}
+        self.assertEqual(open_counts, {"ann": 1, "bob": 2})
+
+
+class TaskCursorOrderingTests(APITestCase):
+    def setUp(self):
+        role = Role.objects.create(name="Viewer", can_view_tasks=True)
+        user = User.objects.create(username="viewer", email="viewer@example.com", role=role)
+        self.client.force_authenticate(user)
+        Task.objects.create(title="Task", created_by=user)
+
+    def test_supported_ordering(self):
+        response = self.client.get("/api/tasks/", {"pagination": "cursor", "ordering": "-deadline"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_orderings_without_a_key_are_rejected(self):
+        for params in ({"ordering": "overdue"}, {"ordering": "-overdue"}, {"search": "task"}):
+            response = self.client.get("/api/tasks/", {"pagination": "cursor", **params})
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn("ordering", response.data)
+
+    def test_search_with_explicit_ordering(self):
+        response = self.client.get("/api/tasks/", {"pagination": "cursor", "search": "task", "ordering": "-created_at"})
+        self.assertEqual(response.status_code, 200)
+
+
+class ReminderChunkLoopTests(TestCase):
+    def test_chunks_continue_past_tasks_without_a_recipient(self):
+        owner = User.objects.create(username="owner", email="owner@example.com")
+        past = timezone.now() - timedelta(minutes=5)
+        # Oldest first: the first chunk only claims tasks nobody is notified about.
+        for minutes in (3, 2):
+            Task.objects.create(title="Orphan", reminder_datetime=past - timedelta(minutes=minutes))
+        Task.objects.create(title="Owned", created_by=owner, reminder_datetime=past)
+        call_command("check_reminders_and_deadlines", chunk_size=2, stdout=StringIO())
+        self.assertFalse(Task.objects.filter(reminder_sent_at__isnull=True).exists())
+        self.assertTrue(Notification.objects.filter(recipient=owner, notification_type=Notification.TYPE_REMINDER).exists())
@@ -6,10 +6,18 @@ from .views import (
     TaskLinkListCreateView,
     TaskLinkDetailView,
     TaskStatusHistoryView,
+    TaskStatsView,
+    TaskBulkView,
+    TaskChangesView,
+    TaskAnalyticsView,
 )
 
 urlpatterns = [
     path("tasks/", TaskListCreateView.as_view(), name="task_list"),
+    path("tasks/stats/", TaskStatsView.as_view(), name="task_stats"),
+    path("tasks/analytics/", TaskAnalyticsView.as_view(), name="task_analytics"),
+    path("tasks/bulk/", TaskBulkView.as_view(), name="task_bulk"),
+    path("tasks/changes/", TaskChangesView.as_view(), name="task_changes"),
     path("tasks/<int:pk>/", TaskDetailView.as_view(), name="task_detail"),
     path("tasks/<int:task_id>/comments/", TaskCommentListCreateView.as_view(), name="task_comments"),
     path("tasks/<int:task_id>/links/", TaskLinkListCreateView.as_view(), name="task_links"),
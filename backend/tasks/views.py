@@ -1,65 +1,175 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
-from django.db.models import Q, Count
-from rest_framework import generics, filters
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework import generics, filters, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
-from .models import Task, TaskComment, TaskLink
-from .serializers import TaskSerializer, TaskCommentSerializer, TaskLinkSerializer
-from .permissions import TaskPermissions, user_can_see_all_tasks, user_can_view_task
+from .models import Task, TaskComment, TaskLink, TaskStatusTransition, overdue_annotation
+from .serializers import (
+    TaskSerializer,
+    TaskListSerializer,
+    TaskCommentSerializer,
+    TaskLinkSerializer,
+    TaskBulkSerializer,
+)
+from .permissions import TaskPermissions, user_can_see_all_tasks, user_can_view_task, user_has_perm
 from .filters import TaskFilter
+from .visibility import filter_visible, assigned_task_ids, visible_task_ids
+from .pagination import TaskKeysetPagination
+from .search import TaskSearchFilter
+from . import cache as task_list_cache
+from .visibility import task_audience_ids
+from .stats import compute_task_stats
+from .analytics import GROUP_BY_CHOICES, compute_cycle_time_analytics
+from . import bulk
+from . import sync
+from . import scheduler
+from config.pagination import KeysetPaginationMixin
+from config.conditional import ConditionalGetMixin, etag_matches, not_modified
 from attachments.models import Attachment
+from attachments.serializers import AttachmentSerializer
+from audit_logs import sink as audit
 from audit_logs.models import AuditLog
 from notifications.models import Notification
+from notifications import outbox
+from notifications.dispatch import NotificationDispatcher
 
 
-def _task_queryset_base():
-    return Task.objects.select_related("created_by", "assigned_to", "assigned_to_role").prefetch_related("assignees").annotate(
-        _attachment_count=Count("attachments", distinct=True)
+def _attachment_count_subquery():
+    # Correlated per-row count: evaluated only for the rows actually returned, no GROUP BY over the page.
+    return Coalesce(
+        Subquery(
+            Attachment.objects.filter(task=OuterRef("pk"))
+            .order_by()
+            .values("task")
+            .annotate(c=Count("id"))
+            .values("c")
+        ),
+        0,
     )
 
 
-def _visible_tasks(user):
+# Serializer field -> relation it needs loaded.
+_DETAIL_RELATIONS = {
+    "created_by_detail": "created_by",
+    "assigned_to_detail": "assigned_to",
+    "assigned_to_role_detail": "assigned_to_role",
+}
+
+
+def _task_queryset_base(fields=None):
+    """
+    Task queryset for serialization. `fields` is the set of serializer fields the response
+    will contain (None = all); only the relations/annotations those fields need are loaded.
+    """
+    def wants(*names):
+        return fields is None or any(name in fields for name in names)
+
+    qs = Task.objects.defer("search_vector").annotate(overdue=overdue_annotation())
+    related = [rel for detail, rel in _DETAIL_RELATIONS.items() if wants(detail)]
+    if related:
+        qs = qs.select_related(*related)
+    if wants("assignees", "assignees_detail"):
+        qs = qs.prefetch_related("assignees")
+    if wants("attachment_count"):
+        qs = qs.annotate(_attachment_count=_attachment_count_subquery())
+    if not wants("description"):
+        qs = qs.defer("description")
+    return qs
+
+
+def _visible_tasks(user, fields=None):
     """Tasks visible to user: created by them, assigned_to them, or in assignees. Staff see all."""
     if user_can_see_all_tasks(user):
-        return _task_queryset_base()
-    return _task_queryset_base().filter(
-        Q(created_by=user) | Q(assigned_to=user) | Q(assignees=user)
-    ).distinct()
+        return _task_queryset_base(fields)
+    return filter_visible(_task_queryset_base(fields), user)
 
 
 def _broadcast_task_list_invalidate(user_ids):
-    """Notify users to refresh their task list (real-time create/assign/update)."""
-    channel_layer = get_channel_layer()
-    if not channel_layer:
-        return
+    """Notify users to refresh their task list (real-time create/assign/update) and drop their cached lists."""
+    user_ids = list(user_ids)
+    transaction.on_commit(lambda: task_list_cache.invalidate_task_lists(user_ids))
     payload = {"type": "task_list_invalidate"}
-    for uid in set(user_ids):
-        async_to_sync(channel_layer.group_send)(
-            f"notifications_{uid}",
-            {"type": "task_list_invalidate", "payload": payload},
-        )
+    outbox.publish_many(
+        (f"notifications_{uid}", {"type": "task_list_invalidate", "payload": payload})
+        for uid in {uid for uid in user_ids if uid}
+    )
 
 
-class TaskListCreateView(generics.ListCreateAPIView):
+class TaskListCreateView(KeysetPaginationMixin, ConditionalGetMixin, generics.ListCreateAPIView):
+    """
+    List/create tasks. ?pagination=cursor switches to keyset pages (no COUNT, no OFFSET);
+    ?compact=true and ?fields=a,b,c trim the row representation and what is loaded for it.
+    """
     serializer_class = TaskSerializer
     permission_classes = [TaskPermissions]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    keyset_pagination_class = TaskKeysetPagination
+    # Ordering before search so relevance ordering applies when no ?ordering= is given.
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, TaskSearchFilter]
     filterset_class = TaskFilter
     search_fields = ["title", "description"]
-    ordering_fields = ["created_at", "updated_at", "deadline", "priority"]
+    ordering_fields = ["created_at", "updated_at", "deadline", "priority", "overdue"]
     ordering = ["-created_at"]
 
+    def get_serializer_class(self):
+        if self.request.method == "GET" and self.request.query_params.get("compact", "").lower() == "true":
+            return TaskListSerializer
+        return TaskSerializer
+
+    def get_requested_fields(self):
+        """
+        Serializer fields for this response: ?fields=id,title,... (sparse fieldset, "id" always
+        included) intersected with the serializer's fields; None means the full representation.
+        """
+        if self.request.method != "GET":
+            return None
+        available = set(self.get_serializer_class().Meta.fields)
+        raw = self.request.query_params.get("fields")
+        if not raw:
+            return None if self.get_serializer_class() is TaskSerializer else available
+        requested = {name.strip() for name in raw.split(",") if name.strip()}
+        return (requested & available) | {"id"}
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_row_fingerprint(self, obj):
+        # overdue is annotated by _task_queryset_base and flips with time, not with updated_at.
+        return obj.pk, obj.updated_at, obj.overdue
+
+    def list(self, request, *args, **kwargs):
+        key = task_list_cache.cache_key(request, user_can_see_all_tasks(request.user))
+        entry = task_list_cache.get_entry(key) if key else None
+        if entry is not None:
+            if etag_matches(request, entry["headers"]["ETag"]):
+                return not_modified(entry["headers"])
+            response = Response(entry["data"])
+            for name, value in entry["headers"].items():
+                response[name] = value
+            return response
+        response = super().list(request, *args, **kwargs)
+        if key and response.status_code == 200:
+            headers = {name: response[name] for name in ("ETag", "Cache-Control", "Vary")}
+            task_list_cache.set_entry(key, response.data, headers)
+        return response
+
     def get_queryset(self):
-        qs = _visible_tasks(self.request.user)
+        qs = _visible_tasks(self.request.user, self.get_requested_fields())
         my_tasks = self.request.query_params.get("my_tasks")
         if my_tasks and my_tasks.lower() == "true":
-            qs = qs.filter(Q(assigned_to=self.request.user) | Q(assignees=self.request.user)).distinct()
+            qs = qs.filter(id__in=assigned_task_ids(self.request.user))
         return qs
 
     def perform_create(self, serializer):
+        with transaction.atomic(), audit.audit_batch():
+            self._create(serializer)
+
+    def _create(self, serializer):
         assignees_ids = serializer.validated_data.pop("assignees", None)
         serializer.validated_data.pop("assigned_to", None)
         task = serializer.save(created_by=self.request.user)
@@ -73,32 +183,139 @@ class TaskListCreateView(generics.ListCreateAPIView):
         to_notify = set(task.assignees.values_list("id", flat=True))
         if task.assigned_to_id:
             to_notify.add(task.assigned_to_id)
-        for uid in to_notify:
-            if uid == self.request.user.id:
-                continue
-            Notification.objects.create(
-                recipient_id=uid,
-                notification_type=Notification.TYPE_TASK_ASSIGNED,
-                title="Task Assigned",
-                message=f'You were assigned to task "{task.title}"',
-                link=f"/tasks/{task.id}",
-                extra_data={"task_id": task.id},
-            )
+        with NotificationDispatcher() as dispatcher:
+            for uid in to_notify - {self.request.user.id}:
+                dispatcher.add(
+                    uid,
+                    Notification.TYPE_TASK_ASSIGNED,
+                    "Task Assigned",
+                    f'You were assigned to task "{task.title}"',
+                    f"/tasks/{task.id}",
+                    {"task_id": task.id},
+                )
         _broadcast_task_list_invalidate([self.request.user.id] + list(to_notify))
 
 
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+class _TaskBundle:
+    """Serializer stand-in whose .data is the task representation plus the included related sets."""
+
+    def __init__(self, serializer, task, includes, context):
+        self.serializer = serializer
+        self.task = task
+        self.includes = includes
+        self.context = context
+
+    @property
+    def data(self):
+        data = dict(self.serializer.data)
+        if "comments" in self.includes:
+            data["comments"] = TaskCommentSerializer(self.task.comments.all(), many=True, context=self.context).data
+        if "links" in self.includes:
+            data["links"] = TaskLinkSerializer(self.task.links.all(), many=True, context=self.context).data
+        if "attachments" in self.includes:
+            data["attachments"] = AttachmentSerializer(self.task.attachments.all(), many=True, context=self.context).data
+        if "history" in self.includes:
+            data["status_history"] = self.task._status_history
+        return data
+
+
+def _status_history(task_id):
+    """Timeline of status changes for a task (TaskStatusTransition), oldest first."""
+    transitions = (
+        TaskStatusTransition.objects.filter(task_id=task_id)
+        .select_related("changed_by")
+        .order_by("created_at", "id")
+    )
+    return [
+        {
+            "id": t.id,
+            "created_at": t.created_at.isoformat(),
+            "changed_by": {"id": t.changed_by_id, "username": t.changed_by.username} if t.changed_by else None,
+            "from_status": t.from_status,
+            "to_status": t.to_status,
+        }
+        for t in transitions
+    ]
+
+
+class TaskDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
+    """
+    GET ?include=comments,links,attachments,history returns the task page bundle in one round
+    trip: visibility is checked once and each related set is one batched prefetch, so the
+    query count does not grow with the number of comments/links/attachments.
+    """
     serializer_class = TaskSerializer
     permission_classes = [TaskPermissions]
+    bundle_includes = ("comments", "links", "attachments", "history")
+
+    def get_includes(self):
+        if self.request.method != "GET":
+            return []
+        raw = self.request.query_params.get("include", "")
+        requested = {name.strip() for name in raw.split(",")}
+        return [name for name in self.bundle_includes if name in requested]
 
     def get_queryset(self):
-        return _visible_tasks(self.request.user)
+        qs = _visible_tasks(self.request.user)
+        includes = self.get_includes()
+        if "comments" in includes:
+            qs = qs.prefetch_related(
+                Prefetch("comments", queryset=TaskComment.objects.select_related("author").order_by("created_at"))
+            )
+        if "links" in includes:
+            qs = qs.prefetch_related(
+                Prefetch("links", queryset=TaskLink.objects.select_related("added_by").order_by("-created_at"))
+            )
+        if "attachments" in includes:
+            qs = qs.prefetch_related(Prefetch("attachments", queryset=Attachment.objects.order_by("-created_at")))
+        return qs
+
+    def get_object(self):
+        obj = super().get_object()
+        if "history" in self.get_includes():
+            obj._status_history = _status_history(obj.id)
+        return obj
+
+    def get_object_fingerprint(self, obj):
+        fingerprint = [obj.updated_at, obj.is_overdue]
+        # Included sets change without touching the task row; fingerprint them from the prefetched rows.
+        for name in self.get_includes():
+            if name == "history":
+                ids = [entry["id"] for entry in obj._status_history]
+            else:
+                ids = [row.id for row in getattr(obj, name).all()]
+            fingerprint.append(f"{name}:{len(ids)}:{sum(ids)}:{max(ids, default=0)}")
+        return fingerprint
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if args and isinstance(args[0], Task) and self.get_includes():
+            return _TaskBundle(serializer, args[0], self.get_includes(), self.get_serializer_context())
+        return serializer
+
+    def get_last_modified(self, obj):
+        # Included rows change without touching updated_at, so only the ETag can validate a bundle.
+        if self.get_includes():
+            return None
+        # is_overdue flips when the deadline passes, without a write.
+        if obj.is_overdue:
+            return max(obj.updated_at, obj.deadline)
+        return obj.updated_at
+
+    # Changes to these fields write an "update" audit entry and notify the assignees.
+    audited_fields = ("title", "description", "priority", "deadline", "reminder_datetime")
 
     def perform_update(self, serializer):
+        with transaction.atomic(), audit.audit_batch():
+            self._update(serializer)
+
+    def _update(self, serializer):
         old = serializer.instance
         old_assigned_to = old.assigned_to_id
         old_assignees = set(old.assignees.values_list("id", flat=True))
         old_status = old.status
+        # serializer.save() updates this same instance, so snapshot the fields compared below.
+        old_values = {f: getattr(old, f) for f in self.audited_fields}
         data = serializer.validated_data
         assignees_ids = data.pop("assignees", None)
         if "assigned_to" in data and data["assigned_to"] is not None:
@@ -120,86 +337,211 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
         new_assignees = set(task.assignees.values_list("id", flat=True))
         added = new_assignees - old_assignees
         assigned_to_pk = getattr(task.assigned_to_id, "id", task.assigned_to_id)
+        dispatcher = NotificationDispatcher()
+        assigned_message = f'You were assigned to task "{task.title}"'
+        updated_message = f'Task "{task.title}" was updated.'
+        link, extra = f"/tasks/{task.id}", {"task_id": task.id}
         if added or (assigned_to_pk and assigned_to_pk != old_assigned_to):
-            AuditLog.objects.create(
-                user=user,
-                action=AuditLog.ACTION_ASSIGN,
-                model_name="task",
-                object_id=task.id,
-                changes={"assignees": list(new_assignees), "previous": list(old_assignees)},
+            audit.record(
+                user,
+                AuditLog.ACTION_ASSIGN,
+                "task",
+                task.id,
+                {"assignees": list(new_assignees), "previous": list(old_assignees)},
             )
             for uid in added:
-                Notification.objects.create(
-                    recipient_id=uid,
-                    notification_type=Notification.TYPE_TASK_ASSIGNED,
-                    title="Task Assigned",
-                    message=f'You were assigned to task "{task.title}"',
-                    link=f"/tasks/{task.id}",
-                    extra_data={"task_id": task.id},
-                )
+                dispatcher.add(uid, Notification.TYPE_TASK_ASSIGNED, "Task Assigned", assigned_message, link, extra)
             if assigned_to_pk and assigned_to_pk not in old_assignees and assigned_to_pk not in added:
-                Notification.objects.create(
-                    recipient_id=assigned_to_pk,
-                    notification_type=Notification.TYPE_TASK_ASSIGNED,
-                    title="Task Assigned",
-                    message=f'You were assigned to task "{task.title}"',
-                    link=f"/tasks/{task.id}",
-                    extra_data={"task_id": task.id},
+                dispatcher.add(
+                    assigned_to_pk, Notification.TYPE_TASK_ASSIGNED, "Task Assigned", assigned_message, link, extra
                 )
         if old_status != task.status:
-            AuditLog.objects.create(
-                user=user,
-                action=AuditLog.ACTION_STATUS,
-                model_name="task",
-                object_id=task.id,
-                changes={"status": task.status, "previous": old_status},
-            )
-        if (
-            old.title != task.title
-            or old.description != task.description
-            or old.priority != task.priority
-            or old.deadline != task.deadline
-            or old.reminder_datetime != task.reminder_datetime
-        ):
-            AuditLog.objects.create(
-                user=user,
-                action=AuditLog.ACTION_UPDATE,
-                model_name="task",
-                object_id=task.id,
-                changes={"title": task.title},
+            audit.record(user, AuditLog.ACTION_STATUS, "task", task.id, {"status": task.status, "previous": old_status})
+            TaskStatusTransition.objects.create(
+                task=task, from_status=old_status, to_status=task.status, changed_by=user
             )
-            for uid in new_assignees:
-                if uid != user.id:
-                    Notification.objects.create(
-                        recipient_id=uid,
-                        notification_type=Notification.TYPE_TASK_UPDATED,
-                        title="Task Updated",
-                        message=f'Task "{task.title}" was updated.',
-                        link=f"/tasks/{task.id}",
-                        extra_data={"task_id": task.id},
-                    )
+        if any(old_values[f] != getattr(task, f) for f in self.audited_fields):
+            audit.record(user, AuditLog.ACTION_UPDATE, "task", task.id, {"title": task.title})
+            for uid in new_assignees - {user.id}:
+                dispatcher.add(uid, Notification.TYPE_TASK_UPDATED, "Task Updated", updated_message, link, extra)
         if assigned_to_pk and assigned_to_pk != user.id and assigned_to_pk not in new_assignees:
-            Notification.objects.create(
-                recipient_id=assigned_to_pk,
-                notification_type=Notification.TYPE_TASK_UPDATED,
-                title="Task Updated",
-                message=f'Task "{task.title}" was updated.',
-                link=f"/tasks/{task.id}",
-                extra_data={"task_id": task.id},
-            )
+            dispatcher.add(assigned_to_pk, Notification.TYPE_TASK_UPDATED, "Task Updated", updated_message, link, extra)
+        dispatcher.flush()
+        old_audience = old_assignees | {old_assigned_to, task.created_by_id}
+        new_audience = new_assignees | {assigned_to_pk, task.created_by_id}
+        sync.record_hidden(task.id, old_audience - new_audience)
+        # Previous assignees and the creator see the change too (or lose the task).
         _broadcast_task_list_invalidate(
-            [user.id] + list(new_assignees) + ([assigned_to_pk] if assigned_to_pk else [])
+            [user.id, task.created_by_id, old_assigned_to]
+            + list(new_assignees | old_assignees)
+            + ([assigned_to_pk] if assigned_to_pk else [])
         )
 
     def perform_destroy(self, instance):
-        AuditLog.objects.create(
-            user=self.request.user,
-            action=AuditLog.ACTION_DELETE,
-            model_name="task",
-            object_id=instance.id,
-            changes={"title": instance.title},
+        # Audit entry, tombstone and delete commit together; the broadcast goes out after commit.
+        with transaction.atomic(), audit.audit_batch():
+            audit.record(self.request.user, AuditLog.ACTION_DELETE, "task", instance.id, {"title": instance.title})
+            audience = task_audience_ids(instance)
+            sync.record_deleted([instance.id])
+            instance.delete()
+            _broadcast_task_list_invalidate([self.request.user.id] + list(audience))
+
+
+class TaskBulkView(APIView):
+    """
+    POST /api/tasks/bulk/ — one action over many tasks in a single transaction:
+    {"action": "create", "tasks": [...]}, {"action": "status", "ids": [...], "status": ...},
+    {"action": "reassign", "ids": [...], "assignees": [...]}, {"action": "priority", "ids": [...], "priority": ...},
+    {"action": "delete", "ids": [...]}.
+    """
+    # Per-action role flags are checked in post(); TaskPermissions would demand can_create_tasks for any POST.
+    permission_classes = [permissions.IsAuthenticated]
+    action_perms = {
+        TaskBulkSerializer.ACTION_CREATE: "can_create_tasks",
+        TaskBulkSerializer.ACTION_STATUS: "can_edit_tasks",
+        TaskBulkSerializer.ACTION_REASSIGN: "can_edit_tasks",
+        TaskBulkSerializer.ACTION_PRIORITY: "can_edit_tasks",
+        TaskBulkSerializer.ACTION_DELETE: "can_delete_tasks",
+    }
+
+    def post(self, request):
+        serializer = TaskBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        action = data["action"]
+        user = request.user
+        if not user_has_perm(user, self.action_perms[action]):
+            from rest_framework.exceptions import PermissionDenied
+            raise PermissionDenied(f"You do not have permission to {action} tasks.")
+
+        with transaction.atomic():
+            if action == TaskBulkSerializer.ACTION_CREATE:
+                result = bulk.bulk_create_tasks(user, data["tasks"])
+            else:
+                tasks = self._load_visible(user, data["ids"])
+                if action == TaskBulkSerializer.ACTION_STATUS:
+                    result = bulk.bulk_update_field(user, tasks, "status", data["status"])
+                elif action == TaskBulkSerializer.ACTION_PRIORITY:
+                    result = bulk.bulk_update_field(user, tasks, "priority", data["priority"])
+                elif action == TaskBulkSerializer.ACTION_REASSIGN:
+                    result = bulk.bulk_reassign(user, tasks, data["assignees"])
+                else:
+                    result = bulk.bulk_delete(user, tasks)
+            if result.removed_task_ids:
+                sync.record_deleted(result.removed_task_ids)
+            for task_id, user_ids in result.hidden.items():
+                sync.record_hidden(task_id, user_ids)
+            audit.record_entries(result.audit_rows)
+            TaskStatusTransition.objects.bulk_create(result.transitions)
+            if action in (TaskBulkSerializer.ACTION_CREATE, TaskBulkSerializer.ACTION_STATUS):
+                scheduler.schedule_on_commit(result.task_ids)  # bulk writes skip tasks.signals
+            dispatcher = NotificationDispatcher()
+            dispatcher.extend(result.notifications)
+            dispatcher.flush()
+            affected = result.affected_user_ids
+            transaction.on_commit(lambda: _broadcast_task_list_invalidate(affected))
+        return Response({"action": action, "count": len(result.task_ids), "ids": result.task_ids})
+
+    def _load_visible(self, user, ids):
+        """Lock the requested tasks; fail the whole batch if any is missing or not visible."""
+        ids = set(ids)
+        qs = Task.objects.select_for_update().filter(id__in=ids).order_by("id")
+        if not user_can_see_all_tasks(user):
+            qs = filter_visible(qs, user)
+        tasks = list(qs.defer("search_vector"))
+        missing = ids - {t.id for t in tasks}
+        if missing:
+            from rest_framework.exceptions import ValidationError
+            raise ValidationError({"ids": [f"Tasks not found: {sorted(missing)}"]})
+        return tasks
+
+
+class TaskChangesView(APIView):
+    """
+    Delta sync: GET /api/tasks/changes/?since=<cursor> -> {"changed": [...], "removed": [ids], "cursor", "has_more"}.
+    Without ?since= only a starting cursor is returned (take it before the initial full fetch).
+    An expired cursor answers 410 Gone: refetch the full list and start over.
+    """
+    permission_classes = [TaskPermissions]
+
+    def get(self, request):
+        since = request.query_params.get("since")
+        if not since:
+            return Response({"changed": [], "removed": [], "cursor": sync.start_cursor(), "has_more": False})
+        try:
+            since = sync.decode_cursor(since)
+        except ValueError:
+            from rest_framework.exceptions import ValidationError
+            raise ValidationError({"since": ["Invalid cursor."]})
+        try:
+            changed, removed, cursor, has_more = sync.collect_changes(
+                _visible_tasks(request.user), request.user, since, user_can_see_all_tasks(request.user)
+            )
+        except sync.CursorExpired:
+            return Response({"detail": "Cursor expired; refetch the task list."}, status=410)
+        return Response({
+            "changed": TaskSerializer(changed, many=True).data,
+            "removed": removed,
+            "cursor": cursor,
+            "has_more": has_more,
+        })
+
+
+class TaskStatsView(APIView):
+    """Dashboard counts (status x priority, overdue, due today/this week, open per assignee) for visible tasks."""
+    permission_classes = [TaskPermissions]
+
+    def get(self, request):
+        sees_all = user_can_see_all_tasks(request.user)
+        timeout = settings.TASK_STATS_CACHE_SECONDS
+        key = task_list_cache.versioned_key("tasks:stats", request.user.pk, sees_all) if timeout else None
+        if key:
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+        qs = Task.objects.all() if sees_all else filter_visible(Task.objects.all(), request.user)
+        data = compute_task_stats(qs)
+        if key:
+            cache.set(key, data, timeout=timeout)
+        return Response(data)
+
+
+class TaskAnalyticsView(APIView):
+    """
+    Cycle time, lead time, time in pending/ongoing and weekly throughput for tasks finished in
+    the last ?weeks= (default 12, max 104), per ?group_by=assignee|role. See tasks.analytics.
+    """
+    permission_classes = [TaskPermissions]
+    default_weeks = 12
+    max_weeks = 104
+
+    def get(self, request):
+        group_by = request.query_params.get("group_by", "assignee")
+        if group_by not in GROUP_BY_CHOICES:
+            return Response({"detail": f"group_by must be one of {', '.join(GROUP_BY_CHOICES)}."}, status=400)
+        try:
+            weeks = int(request.query_params.get("weeks", self.default_weeks))
+        except ValueError:
+            return Response({"detail": "weeks must be an integer."}, status=400)
+        weeks = max(1, min(weeks, self.max_weeks))
+
+        sees_all = user_can_see_all_tasks(request.user)
+        timeout = settings.TASK_STATS_CACHE_SECONDS
+        key = (
+            task_list_cache.versioned_key("tasks:analytics", request.user.pk, sees_all, f"{group_by}:{weeks}")
+            if timeout else None
+        )
+        if key:
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+        since = timezone.now() - timezone.timedelta(weeks=weeks)
+        data = compute_cycle_time_analytics(
+            group_by, since, visible_ids=None if sees_all else visible_task_ids(request.user)
         )
-        instance.delete()
+        if key:
+            cache.set(key, data, timeout=timeout)
+        return Response(data)
 
 
 class TaskCommentListCreateView(generics.ListCreateAPIView):
@@ -231,23 +573,19 @@ class TaskCommentListCreateView(generics.ListCreateAPIView):
         if task.assigned_to_id and task.assigned_to_id != author_id:
             to_notify.add(task.assigned_to_id)
         author_name = self.request.user.username or self.request.user.email or "Someone"
-        for uid in to_notify:
-            Notification.objects.create(
-                recipient_id=uid,
-                notification_type=Notification.TYPE_TASK_COMMENT,
-                title="New comment on task",
-                message=f'{author_name} commented on task "{task.title}".',
-                link=f"/tasks/{task.id}",
-                extra_data={"task_id": task.id, "comment_id": comment.id},
-            )
-        channel_layer = get_channel_layer()
-        if channel_layer:
-            from .serializers import TaskCommentSerializer
-            comment_data = TaskCommentSerializer(comment).data
-            async_to_sync(channel_layer.group_send)(
-                f"task_comments_{task_id}",
-                {"type": "new_comment", "comment": comment_data},
-            )
+        with NotificationDispatcher() as dispatcher:
+            for uid in to_notify:
+                dispatcher.add(
+                    uid,
+                    Notification.TYPE_TASK_COMMENT,
+                    "New comment on task",
+                    f'{author_name} commented on task "{task.title}".',
+                    f"/tasks/{task.id}",
+                    {"task_id": task.id, "comment_id": comment.id, "author_id": author_id},
+                    group_key=f"task_comment:{task.id}",
+                )
+        comment_data = TaskCommentSerializer(comment).data
+        outbox.publish(f"task_comments_{task_id}", {"type": "new_comment", "comment": comment_data})
 
 
 class TaskLinkListCreateView(generics.ListCreateAPIView):
@@ -283,7 +621,7 @@ class TaskLinkDetailView(generics.DestroyAPIView):
 
 
 class TaskStatusHistoryView(APIView):
-    """Timeline of status changes for a task (from AuditLog)."""
+    """Timeline of status changes for a task (from TaskStatusTransition)."""
     permission_classes = [TaskPermissions]
 
     def get(self, request, task_id):
@@ -291,32 +629,4 @@ class TaskStatusHistoryView(APIView):
         if not task or not user_can_view_task(request.user, task):
             from rest_framework.exceptions import NotFound
             raise NotFound()
-        logs = (
-            AuditLog.objects.filter(
-                model_name="task",
-                object_id=task_id,
-                action__in=[AuditLog.ACTION_CREATE, AuditLog.ACTION_STATUS],
-            )
-            .select_related("user")
-            .order_by("created_at")
-        )
-        result = []
-        for log in logs:
-            changes = log.changes or {}
-            if log.action == AuditLog.ACTION_CREATE:
-                from_status = None
-                to_status = changes.get("status", "pending")
-            else:
-                from_status = changes.get("previous")
-                to_status = changes.get("status")
-            result.append({
-                "id": log.id,
-                "created_at": log.created_at.isoformat(),
-                "changed_by": {
-                    "id": log.user_id,
-                    "username": log.user.username if log.user else None,
-                } if log.user else None,
-                "from_status": from_status,
-                "to_status": to_status,
-            })
-        return Response(result)
+        return Response(_status_history(task_id))
@@ -0,0 +1,168 @@
+"""
+Role permission claims in JWTs.
+
+With JWT_PERMISSION_CLAIMS on, tokens issued at login and on refresh carry the role's
+granted permission flags plus two version stamps: one for the role row and one for the
+user (role assignment, is_staff/is_superuser/is_active). PermissionClaimsJWTAuthentication
+compares the stamps with the current counters (one cache round trip, no DB query) and, when
+they match, attaches the claimed flags to request.user so user_has_perm answers without
+loading user.role. Saving a Role or a user's role bumps the counter (see users.signals), so
+older tokens stop being trusted and fall back to the role lookup until the client refreshes.
+
+Cache failures fail open to the database path, never to the claims.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from . import cache as user_cache
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+PERMISSION_FLAGS = (
+    "can_view_tasks",
+    "can_create_tasks",
+    "can_edit_tasks",
+    "can_delete_tasks",
+    "can_assign_tasks",
+    "can_change_task_status",
+    "can_access_chat",
+    "can_manage_users",
+)
+
+# Fields whose change alters what a user's token may claim.
+USER_CLAIM_FIELDS = frozenset({"role", "is_staff", "is_superuser", "is_active"})
+
+
+def _role_version_key(role_id):
+    return f"users:claims:ver:role:{role_id}"
+
+
+def _user_version_key(user_id):
+    return f"users:claims:ver:user:{user_id}"
+
+
+def _initial_version():
+    # Time-based seed: an evicted counter restarts at a value no issued token carries.
+    return int(time.time() * 1000)
+
+
+def _bump(key):
+    try:
+        if not cache.add(key, _initial_version(), timeout=None):
+            cache.incr(key)
+    except Exception:
+        logger.warning("claims version bump failed for %s", key, exc_info=True)
+
+
+def bump_role_version(role_id):
+    _bump(_role_version_key(role_id))
+
+
+def bump_user_version(user_id):
+    _bump(_user_version_key(user_id))
+
+
+def _current_versions(user_id, role_id):
+    keys = [_user_version_key(user_id), _role_version_key(role_id)]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _initial_version(), timeout=None)
+    if len(versions) < len(keys):
+        versions = cache.get_many(keys)
+    return versions.get(keys[0]), versions.get(keys[1])
+
+
+def claims_enabled():
+    return getattr(settings, "JWT_PERMISSION_CLAIMS", False)
+
+
+def add_permission_claims(token, user):
+    """Stamp token with user's current role flags and claim versions (no-op when disabled or unavailable)."""
+    if not claims_enabled():
+        return token
+    try:
+        user_ver, role_ver = _current_versions(user.id, user.role_id)
+    except Exception:
+        logger.warning("claims version read failed; issuing token without permission claims", exc_info=True)
+        return token
+    role = user.role
+    token["perms"] = [flag for flag in PERMISSION_FLAGS if role and getattr(role, flag, False)]
+    token["role_id"] = user.role_id
+    token["claims_ver"] = [user_ver, role_ver]
+    return token
+
+
+def trusted_permissions(validated_token, user_id):
+    """Permission flags from the token if its version stamps are current, else None."""
+    if not claims_enabled() or "perms" not in validated_token:
+        return None
+    try:
+        current = _current_versions(user_id, validated_token.get("role_id"))
+    except Exception:
+        logger.warning("claims version read failed; falling back to role lookup", exc_info=True)
+        return None
+    if list(current) != list(validated_token.get("claims_ver") or []):
+        return None
+    return frozenset(validated_token["perms"])
+
+
+class PermissionClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that loads the user (with role) through users.cache and exposes
+    current permission claims as user.token_permissions.
+    """
+
+    def get_user(self, validated_token):
+        # Same checks as JWTAuthentication.get_user, with the lookup served from the user cache.
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+        user = user_cache.get_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        perms = trusted_permissions(validated_token, user.id)
+        if perms is not None and validated_token.get("role_id") == user.role_id:
+            user.token_permissions = perms
+        return user
+
+
+class PermissionClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_permission_claims(super().get_token(user), user)
+
+
+class PermissionClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh re-reads the user's role so the new access token carries current claims, not the refresh token's copy."""
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        if not claims_enabled():
+            return data
+        user_id = RefreshToken(attrs["refresh"], verify=False).get(api_settings.USER_ID_CLAIM)
+        user = User.objects.select_related("role").filter(pk=user_id).first()
+        if user is None:
+            return data
+        data["access"] = str(add_permission_claims(AccessToken(data["access"]), user))
+        if "refresh" in data:
+            data["refresh"] = str(add_permission_claims(RefreshToken(data["refresh"]), user))
+        return data
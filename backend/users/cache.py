@@ -0,0 +1,118 @@
+"""
+User + role cache for authentication (HTTP via PermissionClaimsJWTAuthentication, WebSocket
+via config.middleware.get_user_from_token).
+
+Two tiers: a small per-process LRU (AUTH_USER_CACHE_LOCAL_SECONDS, short so other processes
+converge quickly after a change) in front of the shared cache (AUTH_USER_CACHE_SECONDS).
+Entries are pickled User rows with their role already loaded, so user.role costs nothing;
+each lookup returns a fresh copy, never a shared instance. Saving a User or Role drops the
+affected shared entries and this process's LRU (see users.signals).
+
+Cache failures fail open to the database.
+"""
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from config.metrics import HitMissCounter
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+auth_user_counter = HitMissCounter("auth_user_cache")
+
+
+def _key(user_id):
+    return f"users:auth:{user_id}"
+
+
+class _LocalLRU:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is None:
+                return None
+            expires, payload = entry
+            if expires < time.monotonic():
+                del self._data[user_id]
+                return None
+            self._data.move_to_end(user_id)
+            return payload
+
+    def set(self, user_id, payload, timeout):
+        with self._lock:
+            self._data[user_id] = (time.monotonic() + timeout, payload)
+            self._data.move_to_end(user_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._data.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local = _LocalLRU(getattr(settings, "AUTH_USER_CACHE_LOCAL_SIZE", 1024))
+
+
+def _load(user_id):
+    return User.objects.select_related("role").filter(pk=user_id).first()
+
+
+def get_user(user_id):
+    """User (with role loaded) for user_id, or None if it does not exist."""
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+    payload = _local.get(user_id)
+    if payload is None:
+        try:
+            payload = cache.get(_key(user_id))
+        except Exception:
+            logger.warning("auth user cache read failed", exc_info=True)
+            payload = None
+        if payload is None:
+            auth_user_counter.miss()
+            user = _load(user_id)
+            if user is None:
+                return None
+            payload = pickle.dumps(user)
+            try:
+                cache.set(_key(user_id), payload, timeout=settings.AUTH_USER_CACHE_SECONDS)
+            except Exception:
+                logger.warning("auth user cache write failed", exc_info=True)
+            _local.set(user_id, payload, settings.AUTH_USER_CACHE_LOCAL_SECONDS)
+            return user
+        _local.set(user_id, payload, settings.AUTH_USER_CACHE_LOCAL_SECONDS)
+    auth_user_counter.hit()
+    return pickle.loads(payload)
+
+
+def invalidate_users(user_ids):
+    user_ids = [uid for uid in user_ids if uid]
+    _local.discard(user_ids)
+    try:
+        cache.delete_many([_key(uid) for uid in user_ids])
+    except Exception:
+        logger.warning("auth user cache invalidation failed", exc_info=True)
+
+
+def invalidate_role(role_id):
+    """A role's flags changed: drop every cached member (role saves are rare)."""
+    _local.clear()
+    invalidate_users(list(User.objects.filter(role_id=role_id).values_list("id", flat=True)))
@@ -1,5 +1,7 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
+from . import cache as user_cache
+from .authentication import USER_CLAIM_FIELDS, bump_role_version, bump_user_version
 from .models import User, Role
 
 
@@ -11,3 +13,30 @@ def assign_admin_role_to_superuser(sender, instance, created, **kwargs):
         if admin_role:
             instance.role = admin_role
             instance.save(update_fields=["role"])
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_claims(sender, instance, created, update_fields=None, **kwargs):
+    """Role / staff / active changes make the user's outstanding permission claims stale."""
+    if created or (update_fields is not None and not USER_CLAIM_FIELDS.intersection(update_fields)):
+        return
+    bump_user_version(instance.pk)
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def invalidate_role_claims(sender, instance, **kwargs):
+    bump_role_version(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate_users([instance.pk])
+
+
+@receiver(post_save, sender=Role)
+@receiver(pre_delete, sender=Role)
+def invalidate_cached_role_members(sender, instance, **kwargs):
+    # pre_delete: members are still linked; deletion then nulls their role with a bulk UPDATE.
+    user_cache.invalidate_role(instance.pk)
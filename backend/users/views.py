@@ -3,12 +3,12 @@ from django.views.decorators.csrf import csrf_exempt
 from rest_framework import generics, permissions
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from .authentication import PermissionClaimsTokenObtainPairSerializer, PermissionClaimsTokenRefreshSerializer
 from .models import User, Role
 from .serializers import UserSerializer, UserMinimalSerializer, UserCreateSerializer, RoleSerializer
 
 
-class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+class CustomTokenObtainPairSerializer(PermissionClaimsTokenObtainPairSerializer):
     def validate(self, attrs):
         login = attrs.get("username", "").strip()
         if "@" in login:
@@ -29,6 +29,7 @@ class CustomTokenObtainPairView(TokenObtainPairView):
 
 @method_decorator(csrf_exempt, name="dispatch")
 class ThrottledTokenRefreshView(TokenRefreshView):
+    serializer_class = PermissionClaimsTokenRefreshSerializer
     throttle_classes = [UserRateThrottle]
 
 
@@ -58,10 +58,15 @@ export function NotificationsPage() {
               )}>
                 <CardContent className="flex flex-col sm:flex-row sm:items-center sm:justify-between gap-3 p-4 sm:p-5">
                   <div className="min-w-0 flex-1">
-                    <p className="font-medium text-foreground">{n.title}</p>
+                    <p className="font-medium text-foreground">
+                      {n.title}
+                      {(n.count ?? 1) > 1 && (
+                        <span className="ml-1.5 text-xs text-muted-foreground tabular-nums">×{n.count}</span>
+                      )}
+                    </p>
                     <p className="text-sm text-muted-foreground mt-0.5">{n.message}</p>
                     <time className="text-xs text-muted-foreground mt-1 block">
-                      {format(new Date(n.created_at), 'PPp')}
+                      {format(new Date(n.last_event_at ?? n.created_at), 'PPp')}
                     </time>
                   </div>
                   {n.link && (
@@ -9,6 +9,10 @@ export interface NotificationItem {
   read: boolean
   created_at: string
   extra_data: Record<string, unknown>
+  /** Events coalesced into this notification (e.g. chat messages in one channel). */
+  count?: number
+  /** When the latest coalesced event arrived (null until the first one). */
+  last_event_at?: string | null
 }
 
 export const notificationsApi = {
@@ -19,6 +23,10 @@ export const notificationsApi = {
     const d = r.data
     return Array.isArray(d) ? d : (d.results ?? [])
   },
+  unreadCount: async (): Promise<number> => {
+    const r = await apiClient.get<{ unread_count: number }>('/notifications/unread_count/')
+    return r.data.unread_count
+  },
   markRead: (id: number) =>
     apiClient.patch(`/notifications/${id}/read/`).then((r) => r.data),
   markAllRead: () =>
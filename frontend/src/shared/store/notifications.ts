@@ -10,6 +10,7 @@ interface NotificationsState {
   markRead: (id: number) => Promise<void>
   markAllRead: () => Promise<void>
   pushOne: (n: NotificationItem) => void
+  applyUpdate: (n: NotificationItem) => void
 }
 
 export const useNotificationsStore = create<NotificationsState>((set) => ({
@@ -19,8 +20,10 @@ export const useNotificationsStore = create<NotificationsState>((set) => ({
   fetch: async () => {
     set({ loading: true })
     try {
-      const items = await notificationsApi.list()
-      const unreadCount = items.filter((n) => !n.read).length
+      const [items, unreadCount] = await Promise.all([
+        notificationsApi.list(),
+        notificationsApi.unreadCount(),
+      ])
       set({ items, unreadCount })
     } finally {
       set({ loading: false })
@@ -46,4 +49,12 @@ export const useNotificationsStore = create<NotificationsState>((set) => ({
       unreadCount: n.read ? s.unreadCount : s.unreadCount + 1,
     }))
   },
+  // A coalesced notification changed (still the same unread row): replace it in place, count unchanged.
+  applyUpdate: (n: NotificationItem) => {
+    set((s) => ({
+      items: s.items.some((x) => x.id === n.id)
+        ? s.items.map((x) => (x.id === n.id ? n : x))
+        : [n, ...s.items],
+    }))
+  },
 }))
@@ -115,9 +115,10 @@ export function Layout() {
           refreshOverdueCount()
           return
         }
-        const payload = data as NotificationItem
+        const updated = data?.type === 'notification_updated'
+        const payload = (updated ? data.payload : data) as NotificationItem
         if (payload?.id != null && payload?.title != null) {
-          useNotificationsStore.getState().pushOne({
+          const item: NotificationItem = {
             id: payload.id,
             notification_type: payload.notification_type ?? '',
             title: payload.title,
@@ -126,7 +127,12 @@ export function Layout() {
             read: payload.read ?? false,
             created_at: payload.created_at ?? new Date().toISOString(),
             extra_data: payload.extra_data ?? {},
-          })
+            count: payload.count ?? 1,
+            last_event_at: payload.last_event_at ?? null,
+          }
+          const store = useNotificationsStore.getState()
+          if (updated) store.applyUpdate(item)
+          else store.pushOne(item)
           playNotificationSound()
           if (payload.notification_type === 'deadline') {
             tasksApi.list({ my_tasks: true }).then((res) => {